@@ -0,0 +1,149 @@
+# accounts/authentication.py
+"""
+JWT authentication without a ``SELECT ... FROM auth_user`` per request.
+
+``CachedJWTAuthentication`` resolves users through a small per-process LRU
+with a short TTL. Saving or deleting a User (password change, deactivation,
+staff flag…) evicts the entry in the process that made the change; other
+worker processes pick the change up once the TTL expires.
+
+``ClaimsJWTAuthentication`` is for hot write endpoints: it trusts the
+``is_active`` / ``is_staff`` claims embedded when the token was issued
+(see ``accounts.jwt``) and returns a ``TokenUser`` without any lookup.
+Views behind it must use ``request.user.id`` rather than the User instance.
+
+Both offer ``aauthenticate()`` for native async views: header parsing and
+token validation are CPU only, so just a cache miss leaves the event loop.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (expires_at, user)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.copy(entry[1])  # views may mutate request.user
+
+    def put(self, user_id, user):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        user = self._cached_user(user_id, validated_token)
+        if user is None:
+            user = super().get_user(validated_token)  # runs the active / revoke checks
+            user_cache.put(user_id, user)
+        return user
+
+    async def aget_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        user = self._cached_user(user_id, validated_token)
+        if user is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            user_cache.put(user_id, user)
+        return user
+
+    async def aauthenticate(self, request):
+        """``authenticate()`` for async views; returns ``(user, token)`` or None."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    @staticmethod
+    def _user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    @staticmethod
+    def _cached_user(user_id, validated_token):
+        user = user_cache.get(user_id)
+        if user is None:
+            return None
+
+        # Same checks the parent applies to a freshly loaded row.
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    Stateless when ``JWT_TRUST_CLAIMS`` is on and the token carries the
+    claims; otherwise (older tokens, setting off) falls back to the cached
+    lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self._trusts_claims(validated_token):
+            return super().get_user(validated_token)
+        return self._token_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        if not self._trusts_claims(validated_token):
+            return await super().aget_user(validated_token)
+        return self._token_user(validated_token)
+
+    @staticmethod
+    def _trusts_claims(validated_token):
+        return settings.JWT_TRUST_CLAIMS and "is_active" in validated_token
+
+    @staticmethod
+    def _token_user(validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -18,3 +18,11 @@ class VerifiedEmailTokenSerializer(TokenObtainPairSerializer):
             )
 
         return data
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Read by ClaimsJWTAuthentication so hot endpoints can skip the user lookup.
+        token["is_active"] = user.is_active
+        token["is_staff"] = user.is_staff
+        return token
@@ -2,6 +2,10 @@
 from allauth.account.signals import email_confirmed
 from django.dispatch import receiver
 from django.db import transaction # Import transaction to ensure atomicity
+from django.db.models.signals import post_delete, post_save
+from django.contrib.auth.models import User
+
+from .authentication import user_cache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -40,3 +44,10 @@ def activate_user_after_email_confirmation(request, email_address, **kwargs):
             logger.error(f"[Signal] WARNING: Email address {email_address.email} still not verified after email_confirmed signal. This indicates a deeper allauth issue or a timing problem.")
         else:
             logger.info(f"[Signal] Email address {email_address.email} is confirmed (verified=True).")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    # Password change, deactivation and staff changes all end in a save.
+    user_cache.invalidate(instance.pk)
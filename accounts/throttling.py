@@ -0,0 +1,82 @@
+# accounts/throttling.py
+"""
+Protection for the expensive auth endpoints (password hashing, SMTP).
+
+* Scoped rate throttles keep their counters in the ``throttle`` cache:
+  the shared Redis when REDIS_URL is set, so a limit holds across all
+  workers, otherwise process-local memory, where it applies per worker.
+  Clients are told apart by IP, with ``NUM_PROXIES`` trusted hops of
+  X-Forwarded-For.
+* ``password_checks`` caps how many password hashes / sign-ups run at once,
+  with an in-flight counter in the same cache (so across all workers with
+  Redis); past that, requests are shed with 503 + Retry-After instead of
+  queueing behind each other and starving the catalog endpoints.
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class CachedScopedRateThrottle(ScopedRateThrottle):
+    cache = caches["throttle"]
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests right now, please retry shortly."
+    default_code = "overloaded"
+    wait = 1  # DRF turns this into a Retry-After header
+
+
+class ConcurrencyLimiter:
+    """
+    At most ``limit`` blocks in flight, counted under ``key`` in the
+    ``throttle`` cache: incremented on entry, decremented on exit. The key
+    expires ``ttl`` seconds after it was created and starts again from 0, so
+    slots held by a worker that died mid-request are not lost for good.
+    """
+    poll = 0.05
+
+    def __init__(self, key, limit, wait=0.0, ttl=30):
+        self.key, self.limit, self.wait, self.ttl = key, limit, wait, ttl
+
+    @contextmanager
+    def slot(self):
+        deadline = time.monotonic() + self.wait
+        while not self._acquire():
+            if time.monotonic() >= deadline:
+                raise Overloaded()
+            time.sleep(self.poll)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _acquire(self):
+        cache = caches["throttle"]
+        cache.add(self.key, 0, self.ttl)
+        try:
+            count = cache.incr(self.key)
+        except ValueError:  # expired between add() and incr()
+            return False
+        if count > self.limit:
+            self._release()
+            return False
+        return True
+
+    def _release(self):
+        cache = caches["throttle"]
+        try:
+            if cache.decr(self.key) < 0:  # the key was reset while we held a slot
+                cache.incr(self.key)
+        except ValueError:  # expired while we held a slot
+            pass
+
+
+password_checks = ConcurrencyLimiter("auth:in-flight", settings.AUTH_MAX_CONCURRENT,
+                                     settings.AUTH_CONCURRENCY_WAIT, settings.AUTH_CONCURRENCY_TTL)
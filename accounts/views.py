@@ -11,6 +11,7 @@ from allauth.account.models import EmailAddress
 from allauth.account.utils import send_email_confirmation
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .jwt import VerifiedEmailTokenSerializer
+from .throttling import CachedScopedRateThrottle, password_checks
 from allauth.account.models import EmailConfirmationHMAC
 from django.shortcuts import redirect
 from django.http import HttpResponse
@@ -22,6 +23,8 @@ logger = logging.getLogger(__name__) # Initialize logger for this module
 
 class ResendConfirmationView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [CachedScopedRateThrottle]
+    throttle_scope = "resend_confirm"
     def post(self, request):
         email = request.data.get("email", "").lower()
         try:
@@ -34,6 +37,12 @@ class ResendConfirmationView(APIView):
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
+    throttle_classes = [CachedScopedRateThrottle]
+    throttle_scope = "register"
+
+    def create(self, request, *args, **kwargs):
+        with password_checks.slot():  # password hashing + confirmation mail
+            return super().create(request, *args, **kwargs)
 
 class ProtectedView(APIView):
     permission_classes = [IsAuthenticated]
@@ -52,8 +61,14 @@ def user_profile(request):
 
 class VerifiedEmailTokenView(TokenObtainPairView):
     serializer_class = VerifiedEmailTokenSerializer
+    throttle_classes = [CachedScopedRateThrottle]
+    throttle_scope = "token"
 
     def post(self, request, *args, **kwargs):
+        with password_checks.slot():
+            return self._post(request, *args, **kwargs)
+
+    def _post(self, request, *args, **kwargs):
         username_or_email = request.data.get("username") or request.data.get("email")
         user = User.objects.filter(username=username_or_email).first()
 
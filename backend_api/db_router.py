@@ -0,0 +1,111 @@
+# backend_api/db_router.py
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` marks GET/HEAD requests under
+``REPLICA_READ_PATHS`` as replica reads; ``ReplicaRouter`` then sends their
+ORM reads to one of ``DATABASE_REPLICAS``. Everything else (writes, admin,
+management commands, the write-behind flush threads) stays on ``default``.
+
+Read-your-writes: a successful write pins that client (its Authorization
+header, or session cookie) to the primary for ``REPLICA_STICKY_SECONDS``,
+so the favorites list fetched right after a toggle doesn't come from a
+replica that hasn't replayed it yet. Pins live in the default cache, which
+settings require to be the shared Redis (REDIS_URL) whenever replicas are
+configured.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS or not _replica_reads.get():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None  # reads inside a transaction must see its writes
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows, e.g. request.user loaded from a replica
+        # may be assigned to a Favorite written to the primary.
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None  # `migrate --database=replica_0` for a local copy; real replicas are read-only
+
+
+def pin_key(credential):
+    return "db:pin:" + hashlib.md5(credential.encode("utf-8")).hexdigest()
+
+
+def request_pin_key(request):
+    credential = (request.META.get("HTTP_AUTHORIZATION")
+                  or request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    return pin_key(credential) if credential else None
+
+
+def wants_replica(request):
+    return request.method in SAFE_METHODS and request.path.startswith(settings.REPLICA_READ_PATHS)
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = request_pin_key(request)
+        use_replica = wants_replica(request) and not (key and cache.get(key))
+        with replica_reads(use_replica):
+            response = self.get_response(request)
+        if key and request.method not in SAFE_METHODS and response.status_code < 400:
+            cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = request_pin_key(request)
+        use_replica = wants_replica(request) and not (key and await cache.aget(key))
+        with replica_reads(use_replica):
+            response = await self.get_response(request)
+        if key and request.method not in SAFE_METHODS and response.status_code < 400:
+            await cache.aset(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
@@ -0,0 +1,51 @@
+# backend_api/dbpool.py
+"""
+Connection pool metrics for monitoring.
+
+``pool_stats()`` reads psycopg_pool's counters for every pooled alias in
+this worker process: connections checked out, requests waiting for one
+and the time spent waiting. ``/metrics/db-pool/`` serves them as JSON to
+callers presenting ``METRICS_TOKEN`` in ``X-Metrics-Token``.
+"""
+import hmac
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, JsonResponse
+
+
+def pool_stats():
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None or pool.closed:
+            continue  # not pooled, or not opened yet in this process
+        raw = pool.get_stats()
+        requests = raw.get("requests_num", 0)
+        stats[alias] = {
+            "size": raw.get("pool_size", 0),
+            "min_size": raw.get("pool_min", 0),
+            "max_size": raw.get("pool_max", 0),
+            "checked_out": raw.get("pool_size", 0) - raw.get("pool_available", 0),
+            "available": raw.get("pool_available", 0),
+            "waiting": raw.get("requests_waiting", 0),
+            # Counters since the pool opened.
+            "requests": requests,
+            "requests_queued": raw.get("requests_queued", 0),
+            "wait_ms_total": raw.get("requests_wait_ms", 0),
+            "wait_ms_avg": round(raw.get("requests_wait_ms", 0) / requests, 2) if requests else 0.0,
+            "timeouts": raw.get("requests_errors", 0),
+            "connections_opened": raw.get("connections_num", 0),
+            "connect_ms_total": raw.get("connections_ms", 0),
+            "connections_lost": raw.get("connections_lost", 0),
+            "returned_bad": raw.get("returns_bad", 0),
+        }
+    return stats
+
+
+def pool_metrics(request):
+    """GET /metrics/db-pool/ – this worker's pool stats per database alias."""
+    token = settings.METRICS_TOKEN
+    if not token or not hmac.compare_digest(request.headers.get("X-Metrics-Token", ""), token):
+        raise Http404
+    return JsonResponse({"pools": pool_stats()})
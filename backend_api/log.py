@@ -0,0 +1,102 @@
+# backend_api/log.py
+"""
+Logging plumbing referenced from settings.LOGGING.
+
+``QueuedStreamHandler`` puts formatted records on a bounded in-memory queue
+and a background ``QueueListener`` does the actual stream writes, so request
+threads never wait on the console/file lock. When the queue is full records
+are dropped (and counted) rather than blocking.
+
+``SamplingFilter`` and ``RateLimitFilter`` are attached per logger to keep
+chatty loggers (debug-auth lines, per-request timing) affordable.
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def _ensure_listener(self):
+        # Threads don't survive fork, so every worker process starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._listener = QueueListener(self.queue, self.target)
+                self._listener.start()
+                self._pid = os.getpid()
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Drain the queue and stop the writer thread (runs at exit)."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = self._pid = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through a ``rate`` fraction (0–1) of records at or below
+    ``max_level``; more severe records always pass.
+    """
+
+    def __init__(self, rate=1.0, max_level="INFO", name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+        self.max_level = logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+
+    def filter(self, record):
+        if record.levelno > self.max_level or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket: at most ``per_second`` records on average, bursts up to
+    ``burst``. Excess records are dropped; the next record that gets through
+    reports how many were suppressed.
+    """
+
+    def __init__(self, per_second=100, burst=None, name=""):
+        super().__init__(name)
+        self.rate = float(per_second)
+        self.capacity = float(burst or per_second)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.suppressed += 1
+                return False
+            self.tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar records suppressed]"
+        return True
@@ -67,6 +67,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'django.contrib.postgres',       # full-text / trigram search for movies
     'movies',
     #'accounts',
     'accounts.apps.AccountsConfig',
@@ -84,6 +85,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its Server-Timing "total" covers the rest of the stack.
+    'backend_api.timing.ServerTimingMiddleware',
+    # Marks catalog GETs as replica reads (no-op without DATABASE_REPLICA_URLS).
+    'backend_api.db_router.ReplicaRoutingMiddleware',
     # CORS middleware should be placed as high as possible, especially before
     # other middleware that might generate responses (like CommonMiddleware or CSRF)
     'corsheaders.middleware.CorsMiddleware',
@@ -102,12 +107,25 @@ REST_FRAMEWORK = {
     # 'PAGE_SIZE': 20,
     'DEFAULT_PAGINATION_CLASS': None,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
+    # Scoped rates for accounts.throttling.CachedScopedRateThrottle and, for 'view',
+    # movies.views.PlayCountThrottle (per client IP; per worker unless REDIS_URL is
+    # set, see CACHES['throttle']).
+    'DEFAULT_THROTTLE_RATES': {
+        'token': env("THROTTLE_TOKEN", "10/min"),
+        'register': env("THROTTLE_REGISTER", "5/hour"),
+        'resend_confirm': env("THROTTLE_RESEND_CONFIRM", "3/hour"),
+        'view': env("THROTTLE_VIEW", "60/min"),
+    },
+    # Reverse proxies in front of the app (see SECURE_PROXY_SSL_HEADER). The client
+    # IP is read that many hops from the right of X-Forwarded-For, so a header
+    # the client sends itself can't pick its throttle bucket; 0 = REMOTE_ADDR.
+    'NUM_PROXIES': int(env("NUM_PROXIES", 1)),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
         # For production, you'd likely want:
@@ -135,18 +153,70 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend_api.wsgi.application'
 
+# Serve the hot movie endpoints from movies/async_views.py. Only worth it
+# under an ASGI server (gunicorn.conf.py picks the uvicorn worker); under
+# WSGI each async view would just be run through async_to_sync.
+ASYNC_VIEWS = env("ASYNC_VIEWS", "False") == "True"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': dj_database_url.config(
-        default=env("DATABASE_URL"),
-        conn_max_age=600,
+# Connection pooling (Django's psycopg 3 pool, one per worker process).
+# Checkouts wait up to DB_POOL_TIMEOUT seconds for a free connection; idle
+# ones above DB_POOL_MIN_SIZE close after DB_POOL_MAX_IDLE seconds. With
+# CONN_HEALTH_CHECKS the pool pings a connection before handing it out.
+# Pool metrics: backend_api/dbpool.py.
+DB_POOL = env("DB_POOL", "True") == "True"
+DB_POOL_OPTIONS = {
+    "min_size": int(env("DB_POOL_MIN_SIZE", 2)),
+    "max_size": int(env("DB_POOL_MAX_SIZE", 10)),
+    "timeout": float(env("DB_POOL_TIMEOUT", 10)),
+    "max_idle": float(env("DB_POOL_MAX_IDLE", 300)),
+}
+
+# The pool keeps connections itself; without it, async views open a connection
+# per request context, so persistent connections would only pile up under ASGI.
+CONN_MAX_AGE = 0 if DB_POOL or ASYNC_VIEWS else 600
+
+
+def database_config(url):
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=CONN_MAX_AGE,
+        conn_health_checks=True,
         ssl_require=True  # Ensures `?sslmode=require` is respected
     )
+    if DB_POOL and config["ENGINE"] == "django.db.backends.postgresql":
+        config["OPTIONS"]["pool"] = dict(DB_POOL_OPTIONS)
+    return config
+
+
+DATABASES = {
+    'default': database_config(env("DATABASE_URL")),
 }
 
+# Read replicas (backend_api/db_router.py): comma-separated URLs, exposed as
+# replica_0, replica_1, … GET/HEAD requests under REPLICA_READ_PATHS read from
+# them, except for a client that wrote in the last REPLICA_STICKY_SECONDS.
+# Those pins live in the cache, so replicas require REDIS_URL (checked below).
+# Locally, a second database copied from the first works as a replica:
+#   createdb -T papertiger papertiger_replica
+#   DATABASE_REPLICA_URLS=postgres://…/papertiger_replica  manage.py check_db_routing
+# The routing tests (movies/tests.py) run against a mirror of the test database:
+#   DATABASE_REPLICA_URLS=$DATABASE_URL REDIS_URL=redis://localhost:6379/1  manage.py test movies
+DATABASE_REPLICAS = []
+for _i, _url in enumerate(u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()):
+    DATABASES[f"replica_{_i}"] = {
+        **database_config(_url),
+        "TEST": {"MIRROR": "default"},  # tests see one database through both aliases
+    }
+    DATABASE_REPLICAS.append(f"replica_{_i}")
+
+DATABASE_ROUTERS = ["backend_api.db_router.ReplicaRouter"]
+REPLICA_READ_PATHS = ("/api/movies/", "/sitemap")
+REPLICA_STICKY_SECONDS = int(env("REPLICA_STICKY_SECONDS", 5))
+
 '''
 DATABASES = {
     'default': {
@@ -158,6 +228,89 @@ DATABASES = {
 
 
 
+# Cache
+# Point REDIS_URL at a shared Redis in production so every worker sees the same
+# catalog version; without it each process keeps its own local-memory cache.
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+if DATABASE_REPLICAS and not REDIS_URL:
+    # A pin in one worker's local memory doesn't stop the next request, on
+    # another worker, from reading a replica that hasn't caught up.
+    raise ImproperlyConfigured("DATABASE_REPLICA_URLS requires REDIS_URL: read-your-writes pins "
+                               "must be shared by every worker.")
+
+# Rate-limit counters: shared through Redis when there is one, so the limits
+# hold across workers; otherwise in process memory, i.e. per worker.
+if REDIS_URL:
+    CACHES['throttle'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'throttle',
+    }
+else:
+    CACHES['throttle'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    }
+
+# Seconds a cached public catalog response may live (upper bound on staleness
+# when the version bump can't reach another process's local cache).
+CATALOG_CACHE_TIMEOUT = int(env("CATALOG_CACHE_TIMEOUT", 300))
+
+# Shared secret for /metrics/db-pool/ (sent as X-Metrics-Token); unset = endpoint off.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Public base URL the web tier / CDN serves MEDIA_ROOT from. When set,
+# /api/movies/snapshot/ redirects there instead of streaming the file itself.
+CATALOG_SNAPSHOT_URL = os.getenv("CATALOG_SNAPSHOT_URL")
+
+# Public site the sitemap <loc>s point at (the frontend, not this API).
+SITEMAP_BASE_URL = env("SITEMAP_BASE_URL", "https://papertigercinema.com").rstrip("/")
+
+# Buffered Movie.views counter: flush every N seconds or M plays, whichever first.
+VIEW_COUNTER_FLUSH_SECONDS = int(env("VIEW_COUNTER_FLUSH_SECONDS", 10))
+VIEW_COUNTER_MAX_EVENTS = int(env("VIEW_COUNTER_MAX_EVENTS", 500))
+
+# Coalesce playback heartbeats in memory and upsert only the latest position
+# per (user, movie). Pause/ended/exit events flush immediately. Reads only see
+# their own worker's buffer, so /progress/ and /library/ may lag the player by
+# up to PROGRESS_FLUSH_SECONDS.
+PROGRESS_COALESCE = env("PROGRESS_COALESCE", "False") == "True"
+PROGRESS_FLUSH_SECONDS = int(env("PROGRESS_FLUSH_SECONDS", 5))
+PROGRESS_MAX_EVENTS = int(env("PROGRESS_MAX_EVENTS", 1000))
+
+# Per-request timing (backend_api/timing.py). Requests slower than
+# SLOW_REQUEST_MS (0 = off) are logged with their SLOW_REQUEST_TOP_SQL slowest statements.
+SERVER_TIMING_HEADER = env("SERVER_TIMING_HEADER", "True") == "True"
+SLOW_REQUEST_MS = int(env("SLOW_REQUEST_MS", 0))
+SLOW_REQUEST_TOP_SQL = int(env("SLOW_REQUEST_TOP_SQL", 5))
+
+# Worker warm-up (backend_api/warmup.py). gunicorn.conf.py starts it in
+# post_worker_init; WARMUP_AT_STARTUP starts it from AppConfig.ready() instead,
+# for servers without that hook. WARMUP_ACCEPT and WARMUP_PAGE_SIZE should
+# match the frontend's Accept header and ?page_size=, since both are part of
+# the catalog cache key.
+WARMUP_AT_STARTUP = env("WARMUP_AT_STARTUP", "False") == "True"
+WARMUP_GENRES = int(env("WARMUP_GENRES", 12))
+WARMUP_PAGE_SIZE = int(env("WARMUP_PAGE_SIZE", 50))
+WARMUP_ACCEPT = env("WARMUP_ACCEPT", "application/json, text/plain, */*")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -230,9 +383,29 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        # backend_api/log.py – per-logger sampling / rate limiting
+        'auth_debug_sample': {
+            '()': 'backend_api.log.SamplingFilter',
+            'rate': env("AUTH_DEBUG_LOG_SAMPLE", "0.01"),  # 1% of debug-auth lines
+        },
+        'auth_debug_rate': {
+            '()': 'backend_api.log.RateLimitFilter',
+            'per_second': 10,
+        },
+        'request_sample': {
+            '()': 'backend_api.log.SamplingFilter',
+            'rate': env("REQUEST_LOG_SAMPLE", "1.0"),  # slow-request WARNINGs always pass
+        },
+        'request_rate': {
+            '()': 'backend_api.log.RateLimitFilter',
+            'per_second': int(env("REQUEST_LOG_RATE_LIMIT", 200)),
+        },
+    },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            # Queue + background writer thread: request threads never block on stderr.
+            '()': 'backend_api.log.QueuedStreamHandler',
             'formatter': 'simple', # Use the simple formatter for console
         },
     },
@@ -254,13 +427,24 @@ LOGGING = {
         'django.request': {
             'handlers': ['console'],
             'level': 'DEBUG',
+            'filters': ['request_rate'],
             # 'propagate': False,
         },
         'django.db.backends': {
             'handlers': ['console'],
-            'level': 'DEBUG',
+            # DEBUG prints every statement; per-request totals come from backend_api.timing.
+            'level': env("SQL_LOG_LEVEL", "INFO"),
+            # 'propagate': False,
+        },
+        'backend_api': {
+            'handlers': ['console'],
+            'level': 'INFO',
             # 'propagate': False,
         },
+        'backend_api.timing': {
+            'level': 'INFO',
+            'filters': ['request_sample'],
+        },
         'accounts': {
             'handlers': ['console'],
             'level': 'INFO',
@@ -276,6 +460,10 @@ LOGGING = {
             'level': 'INFO',
             # 'propagate': False,
         },
+        'movies.auth_debug': {
+            'level': 'INFO',
+            'filters': ['auth_debug_sample', 'auth_debug_rate'],
+        },
     },
 }
 
@@ -331,6 +519,20 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# accounts/authentication.py: per-process user LRU (entries, seconds), and
+# whether hot endpoints trust the is_active / is_staff claims in the token.
+AUTH_USER_CACHE_SIZE = int(env("AUTH_USER_CACHE_SIZE", 10000))
+AUTH_USER_CACHE_TTL = int(env("AUTH_USER_CACHE_TTL", 60))
+JWT_TRUST_CLAIMS = env("JWT_TRUST_CLAIMS", "True") == "True"
+
+# Password checks / sign-ups allowed in flight before shedding with 503 (across
+# all workers with REDIS_URL, per worker otherwise, see CACHES['throttle']), how
+# long (seconds) a request may wait for a free slot, and how often (seconds) the
+# shared counter resets so slots held by a crashed worker come back.
+AUTH_MAX_CONCURRENT = int(env("AUTH_MAX_CONCURRENT", 4))
+AUTH_CONCURRENCY_WAIT = float(env("AUTH_CONCURRENCY_WAIT", 0.5))
+AUTH_CONCURRENCY_TTL = int(env("AUTH_CONCURRENCY_TTL", 30))
+
 CSRF_TRUSTED_ORIGINS = [
     "https://papertigercinema.com",
     "https://www.papertigercinema.com",
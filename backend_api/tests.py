@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from backend_api.timing import ServerTimingMiddleware
+
+
+@override_settings(SERVER_TIMING_HEADER=True, SLOW_REQUEST_MS=0)
+class ServerTimingTests(TestCase):
+    async def test_async_orm_queries_are_counted(self):
+        # The async ORM runs these on sync_to_async's thread, not the caller's.
+        async def view(request):
+            await User.objects.acount()
+            await User.objects.filter(is_staff=True).aexists()
+            return HttpResponse()
+
+        response = await ServerTimingMiddleware(view)(RequestFactory().get("/"))
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+    def test_sync_queries_are_counted(self):
+        def view(request):
+            User.objects.count()
+            return HttpResponse()
+
+        response = ServerTimingMiddleware(view)(RequestFactory().get("/"))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
@@ -0,0 +1,162 @@
+# backend_api/timing.py
+"""
+Per-request timing: SQL count/time (via an ``execute_wrapper`` installed on
+every connection as it is created, so the threads the async ORM runs on are
+covered too), serializer time and total time, reported as a ``Server-Timing`` header and one log
+line per request. Requests slower than ``SLOW_REQUEST_MS`` are logged at
+WARNING together with their slowest statements.
+"""
+import heapq
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger("backend_api.timing")
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self, keep_statements=0):
+        self.queries = 0
+        self.sql = 0.0
+        self.spans = {}
+        self.keep_statements = keep_statements
+        self.slowest = []  # min-heap of (duration, seq, sql), at most keep_statements long
+        self._open = set()
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.sql += duration
+        if self.keep_statements:
+            entry = (duration, self.queries, sql)
+            if len(self.slowest) < self.keep_statements:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def top_statements(self):
+        return [(duration, sql) for duration, _, sql in sorted(self.slowest, reverse=True)]
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(name):
+    """Add the wall time of the block to span ``name``; nested entries count once."""
+    timings = _current.get()
+    if timings is None or name in timings._open:
+        yield
+        return
+    timings._open.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._open.discard(name)
+        timings.spans[name] = timings.spans.get(name, 0.0) + time.perf_counter() - start
+
+
+def sql_timer(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_sql_timer(sender, connection, **kwargs):
+    # Permanent and keyed on the context variable rather than entered per
+    # request: connections are per thread, and the async ORM's queries run
+    # on sync_to_async's thread, not the event loop's. The copied context
+    # still carries the request's timings.
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_timer)
+
+
+class TimedSerializerMixin:
+    """Counts ``to_representation`` towards the request's ``serialize`` span."""
+
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
+
+
+class ServerTimingMiddleware:
+    # Async-capable so native async views (movies/async_views.py) aren't
+    # pushed back onto a thread under ASGI.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = settings.SLOW_REQUEST_MS
+        self.top_n = settings.SLOW_REQUEST_TOP_SQL if self.slow_ms else 0
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        for conn in connections.all(initialized_only=True):  # opened before this module loaded
+            install_sql_timer(None, conn)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings(keep_statements=self.top_n)
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, time.perf_counter() - start, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings(keep_statements=self.top_n)
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, time.perf_counter() - start, timings)
+
+    def finish(self, request, response, total, timings):
+        metrics = [("total", total, None), ("db", timings.sql, f"{timings.queries} queries")]
+        metrics += [(name, seconds, None) for name, seconds in timings.spans.items()]
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = ", ".join(
+                f'{name};dur={seconds * 1000:.1f}' + (f';desc="{desc}"' if desc else "")
+                for name, seconds, desc in metrics
+            )
+        self.log(request, response, total, timings)
+        return response
+
+    def log(self, request, response, total, timings):
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "db_ms": round(timings.sql * 1000, 1),
+            "queries": timings.queries,
+            **{f"{name}_ms": round(seconds * 1000, 1) for name, seconds in timings.spans.items()},
+        }
+        line = " ".join(f"{key}={value}" for key, value in fields.items())
+        if self.slow_ms and fields["total_ms"] >= self.slow_ms:
+            statements = "".join(f"\n  {duration * 1000:.1f}ms {sql[:500]}"
+                                 for duration, sql in timings.top_statements())
+            logger.warning("slow request %s%s", line, statements, extra={"timing": fields})
+        else:
+            logger.info("request %s", line, extra={"timing": fields})
@@ -3,6 +3,9 @@ from django.urls import path, include
 from accounts.views import VerifiedEmailTokenView
 from django.conf import settings
 from django.conf.urls.static import static
+from movies.views import sitemap_index, sitemap_section
+from backend_api.warmup import readiness
+from backend_api.dbpool import pool_metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,6 +13,10 @@ urlpatterns = [
     path('api/accounts/', include('accounts.urls')),
     path("api/auth/", include("allauth.urls")),
     path("api/token/", VerifiedEmailTokenView.as_view(), name="token_obtain_pair"),
+    path("sitemap.xml", sitemap_index, name="sitemap-index"),
+    path("sitemap-<slug:section>.xml", sitemap_section, name="sitemap-section"),
+    path("ready/", readiness, name="readiness"),
+    path("metrics/db-pool/", pool_metrics, name="db-pool-metrics"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,134 @@
+# backend_api/warmup.py
+"""
+Worker warm-up: pay the first-request costs before taking traffic.
+
+``warm_up()`` opens the database connection (TCP + TLS + auth), compiles
+the URL resolver, builds every serializer's fields once, and primes the
+catalog cache with the hero carousel, the featured row, the largest genres'
+first pages and the facet counts by sending anonymous GETs through the full
+middleware stack. The list URLs carry ``page_size=WARMUP_PAGE_SIZE`` like the
+frontend's, since the query string is part of the cache key.
+
+It runs in a background thread, started from gunicorn's ``post_worker_init``
+(gunicorn.conf.py) once the worker has booted, or, for other servers, by
+``MoviesConfig.ready()`` when ``WARMUP_AT_STARTUP`` is set. ``readiness``
+(``/ready/``) answers 503 until a scheduled warm-up finishes, then reports
+how each step went. A failed step is logged and skipped: a cold cache is no
+reason to keep a worker out of rotation.
+"""
+import logging
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.http import JsonResponse
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+_scheduled = False
+_done = threading.Event()
+_report = {}
+
+
+def _open_connections():
+    for conn in connections.all():
+        conn.ensure_connection()
+
+
+def _compile_urls():
+    get_resolver().resolve("/api/movies/")  # populates and compiles every pattern on the way
+
+
+def _build_serializers():
+    from movies import serializers
+
+    for name in ("MovieSerializer", "MovieListSerializer", "FavoriteSerializer",
+                 "WatchLaterSerializer", "PlaybackProgressSerializer", "CommentSerializer"):
+        getattr(serializers, name)().fields
+
+
+def _catalog_paths():
+    from movies.models import Genre
+
+    page = {"page_size": settings.WARMUP_PAGE_SIZE}
+    genres = (Genre.objects.annotate(n=Count("movies")).filter(n__gt=0)
+              .order_by("-n").values_list("name", flat=True)[:settings.WARMUP_GENRES])
+    return (["/api/movies/hero-movies/", "/api/movies/facets/", "/api/movies/genre-rows/",
+             f"/api/movies/?{urlencode({'is_featured': 'true', **page})}"]
+            + [f"/api/movies/?{urlencode({'genre': name, **page})}" for name in genres])
+
+
+def _prime_caches():
+    from django.test import Client
+
+    client = Client(raise_request_exception=False,
+                    HTTP_HOST=settings.ALLOWED_HOSTS[0], HTTP_ACCEPT=settings.WARMUP_ACCEPT)
+    for path in _catalog_paths():
+        response = client.get(path, secure=True)
+        if response.status_code != 200:
+            logger.warning("warm-up GET %s returned %s", path, response.status_code)
+
+
+STEPS = [
+    ("db", _open_connections),
+    ("urls", _compile_urls),
+    ("serializers", _build_serializers),
+    ("caches", _prime_caches),
+]
+
+
+def warm_up():
+    global _scheduled
+    _scheduled = True
+    started = time.perf_counter()
+    try:
+        for name, step in STEPS:
+            _report[name] = "running"
+            start = time.perf_counter()
+            try:
+                step()
+                _report[name] = round((time.perf_counter() - start) * 1000, 1)
+            except Exception:
+                logger.exception("warm-up step %r failed", name)
+                _report[name] = "failed"
+    finally:
+        _done.set()
+    logger.info("warm-up finished in %.0f ms: %s", (time.perf_counter() - started) * 1000, _report)
+
+
+def warm_up_in_background():
+    global _scheduled
+    _scheduled = True
+
+    def run():
+        try:
+            warm_up()
+        finally:
+            connections.close_all()  # this thread's connections only
+
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
+
+
+def is_ready():
+    return not _scheduled or _done.is_set()
+
+
+def warm_up_state():
+    if not _scheduled:
+        return "off"
+    return "done" if _done.is_set() else "running"
+
+
+def readiness(request):
+    """
+    GET /ready/ – 200 once this worker is warm, 503 while it warms up. The
+    body gives the state and each step's time in ms, "running" or "failed".
+    """
+    body = {"ready": is_ready(), "warm_up": warm_up_state(), "steps": dict(_report)}
+    if not body["ready"]:
+        return JsonResponse(body, status=503, headers={"Retry-After": "1"})
+    return JsonResponse(body)
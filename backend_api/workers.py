@@ -0,0 +1,21 @@
+# backend_api/workers.py
+"""
+Gunicorn worker for the ASGI app (``ASYNC_VIEWS=True``, see gunicorn.conf.py).
+
+``ASGI_LIMIT_CONCURRENCY`` caps the requests one worker holds at once;
+past it uvicorn answers 503 straight away rather than letting latency grow
+without bound. Read from the environment because gunicorn loads this
+before Django settings.
+"""
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class CatalogUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "lifespan": "off",  # Django has no lifespan handler
+        "limit_concurrency": int(os.getenv("ASGI_LIMIT_CONCURRENCY", 200)) or None,
+        "timeout_keep_alive": int(os.getenv("ASGI_KEEP_ALIVE", 5)),
+    }
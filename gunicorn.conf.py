@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+#
+#   gunicorn            -> sync WSGI workers (default)
+#   ASYNC_VIEWS=True    -> uvicorn workers serving backend_api.asgi
+#
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 3))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+# Import Django and the URLconf once in the master; workers inherit them.
+preload_app = True
+
+if os.getenv("ASYNC_VIEWS", "False") == "True":
+    wsgi_app = "backend_api.asgi:application"
+    worker_class = "backend_api.workers.CatalogUvicornWorker"
+else:
+    wsgi_app = "backend_api.wsgi:application"
+
+
+def post_worker_init(worker):
+    # Runs once the worker has booted, just before it starts accepting
+    # connections. The warm-up (backend_api/warmup.py) runs in a background
+    # thread, so a slow database can't stall the worker past `timeout` and
+    # get it killed; /ready/ answers 503 until it is done.
+    if os.getenv("WARMUP", "True") != "True":
+        return
+    from django.db import connections
+    from backend_api.warmup import warm_up_in_background
+
+    connections.close_all()  # never reuse a socket opened before the fork
+    warm_up_in_background()
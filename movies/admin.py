@@ -1,11 +1,19 @@
 # your_app_name/admin.py
 
 from django.contrib import admin
-from .models import Movie, Favorite
+from .models import Movie, Favorite, Genre, MovieGenre
+from .cache import bump_catalog_version
 from django.template.defaultfilters import pluralize # Optional, for better messages
+from django.utils import timezone
+
+class MovieGenreInline(admin.TabularInline):
+    model = MovieGenre
+    extra = 0
+
 
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
+    inlines = [MovieGenreInline]
     list_display = ('title', 'year', 'genre', 'is_featured', 'is_public_domain', 'is_hero')
     list_filter = ('is_public_domain', 'genre', 'is_featured', 'year', 'is_hero')
     search_fields = ('title', 'overview')
@@ -15,7 +23,8 @@ class MovieAdmin(admin.ModelAdmin):
         """
         Admin action to set selected movies as featured.
         """
-        updated_count = queryset.update(is_featured=True)
+        updated_count = queryset.update(is_featured=True, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(
             request,
             f"{updated_count} movie{pluralize(updated_count)} successfully marked as featured."
@@ -26,7 +35,8 @@ class MovieAdmin(admin.ModelAdmin):
         """
         Admin action to remove selected movies from featured.
         """
-        updated_count = queryset.update(is_featured=False)
+        updated_count = queryset.update(is_featured=False, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(
             request,
             f"{updated_count} movie{pluralize(updated_count)} successfully removed from featured."
@@ -38,7 +48,8 @@ class MovieAdmin(admin.ModelAdmin):
         """
         Admin action to mark selected movies as public domain.
         """
-        updated_count = queryset.update(is_public_domain=True)
+        updated_count = queryset.update(is_public_domain=True, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(
             request,
             f"{updated_count} movie{pluralize(updated_count)} successfully marked as public domain."
@@ -49,7 +60,8 @@ class MovieAdmin(admin.ModelAdmin):
         """
         Admin action to mark selected movies as NOT public domain.
         """
-        updated_count = queryset.update(is_public_domain=False)
+        updated_count = queryset.update(is_public_domain=False, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(
             request,
             f"{updated_count} movie{pluralize(updated_count)} successfully marked as NOT Public Domain."
@@ -57,15 +69,23 @@ class MovieAdmin(admin.ModelAdmin):
     mark_not_public_domain.short_description = "Mark selected movies as NOT Public Domain"
 
     def make_hero(self, request, queryset):
-        updated_count = queryset.update(is_hero=True)
+        updated_count = queryset.update(is_hero=True, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(request, f"{updated_count} movie{pluralize(updated_count)} marked as Hero Carousel.")
     make_hero.short_description = "Mark selected movies for Hero Carousel"
 
     def remove_hero(self, request, queryset):
-        updated_count = queryset.update(is_hero=False)
+        updated_count = queryset.update(is_hero=False, updated_at=timezone.now())
+        bump_catalog_version()  # bulk update() skips post_save
         self.message_user(request, f"{updated_count} movie{pluralize(updated_count)} removed from Hero Carousel.")
     remove_hero.short_description = "Remove selected movies from Hero Carousel"
 
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
+
 @admin.register(Favorite)
 class FavoriteAdmin(admin.ModelAdmin):
     list_display = ('user', 'movie')
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        import movies.signals  # catalog cache invalidation
+
+        from django.conf import settings
+        if settings.WARMUP_AT_STARTUP:
+            from backend_api.warmup import warm_up_in_background
+            warm_up_in_background()
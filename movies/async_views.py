@@ -0,0 +1,251 @@
+# movies/async_views.py
+"""
+Native async versions of the hottest endpoints, for running under an ASGI
+server (``backend_api/asgi.py``, see ``gunicorn.conf.py``). A slow query
+then parks a coroutine instead of a whole sync worker.
+
+They mirror the DRF views in ``movies/views.py`` (same URLs, bodies,
+status codes, catalog caching and ETags) and are swapped in by
+``movies/urls.py`` when ``ASYNC_VIEWS`` is on. DRF views are sync only, so
+these are plain Django views: auth goes through ``aauthenticate()`` on the
+same JWT classes and responses are rendered with DRF's JSON renderer.
+"""
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+
+from accounts.authentication import CachedJWTAuthentication, ClaimsJWTAuthentication
+from .buffers import progress_buffer
+from .cache import acatalog_cache_key
+from .conditional import apply_validators, list_aggregates, list_token, validators
+from .models import Movie, Favorite, WatchLater, PlaybackProgress
+from .serializers import MovieSerializer, requested_fields, model_columns
+from .views import (PROGRESS_FLUSH_EVENTS, HeroCarouselMovies, MovieDetailSlug, _dbg_show_auth,
+                    parse_position)
+
+_renderer = JSONRenderer()
+
+
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    response = HttpResponse(_renderer.render(data), status=status, headers=headers,
+                            content_type="application/json")
+    patch_vary_headers(response, ["Accept"])  # as DRF's responses
+    return response
+
+
+def _payload(request):
+    """The request body as a dict, or None if it isn't a JSON object / form."""
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST
+
+
+def async_api_view(methods, authentication=CachedJWTAuthentication, login_required=False):
+    """
+    ``@api_view`` for async functions: method check, JWT auth (sets
+    ``request.user``), CSRF exemption and DRF-style JSON errors.
+    ``login_required`` matches ``IsAuthenticatedOrReadOnly`` on write methods.
+    """
+    def decorator(view):
+        @csrf_exempt
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return json_response({"detail": f'Method "{request.method}" not allowed.'},
+                                     status=status.HTTP_405_METHOD_NOT_ALLOWED,
+                                     headers={"Allow": ", ".join(methods)})
+            authenticator = authentication()
+            try:
+                result = await authenticator.aauthenticate(request)
+                if result is None and login_required:
+                    raise NotAuthenticated()
+                request.user, request.auth = result or (AnonymousUser(), None)
+                return await view(request, *args, **kwargs)
+            except APIException as exc:
+                headers = None
+                if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                    headers = {"WWW-Authenticate": authenticator.authenticate_header(request)}
+                data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+                return json_response(data, status=exc.status_code, headers=headers)
+            except Http404 as exc:
+                return json_response({"detail": str(exc) or "Not found."},
+                                     status=status.HTTP_404_NOT_FOUND)
+        return wrapper
+    return decorator
+
+
+async def _cached_catalog_get(request, build_response):
+    """``CatalogCacheMixin.dispatch`` for async views (anonymous GETs only)."""
+    if "HTTP_AUTHORIZATION" in request.META:
+        return await build_response()
+
+    key = await acatalog_cache_key(request)
+    cached = await cache.aget(key)
+    if cached is not None:
+        content, headers = cached
+        if "ETag" in headers:
+            not_modified = get_conditional_response(request, etag=headers["ETag"])
+            if not_modified is not None:
+                return not_modified
+        return HttpResponse(content, headers=headers)
+
+    response = await build_response()
+    if response.status_code == 200:
+        await cache.aset(key, (response.content, dict(response.items())), settings.CATALOG_CACHE_TIMEOUT)
+    return response
+
+
+async def _conditional(request, last_modified, token, build_response):
+    etag, timestamp = validators(request, last_modified, token)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await build_response()
+    return apply_validators(response, etag, timestamp)
+
+
+# -------------------------------------------------------------------
+#  Catalog reads
+# -------------------------------------------------------------------
+
+@async_api_view(["GET"])
+async def hero_movies(request):
+    queryset = Movie.objects.filter(is_hero=True).order_by('-year')
+    counters = HeroCarouselMovies.validator_counters
+
+    async def build():
+        stats = await queryset.order_by().aaggregate(**list_aggregates("updated_at", counters))
+
+        async def render():
+            movies = [movie async for movie in queryset]
+            return json_response(MovieSerializer(movies, many=True).data)
+
+        return await _conditional(request, stats["last_modified"], list_token(stats, counters), render)
+
+    return await _cached_catalog_get(request, build)
+
+
+@async_api_view(["GET"])
+async def movie_detail_slug(request, slug):
+    async def build():
+        row = await (Movie.objects.filter(slug=slug)
+                     .values_list("pk", "updated_at", *MovieDetailSlug.validator_counters).afirst())
+        if row is None:
+            raise Http404("No Movie matches the given query.")
+        pk, last_modified, *counters = row
+
+        async def render():
+            fields = requested_fields(request)
+            columns = model_columns(MovieSerializer(fields=fields), ["slug"])
+            movie = await Movie.objects.only(*columns).aget(pk=pk)
+            return json_response(MovieSerializer(movie, fields=fields).data)
+
+        return await _conditional(request, last_modified, "|".join(map(str, [pk, *counters])), render)
+
+    return await _cached_catalog_get(request, build)
+
+
+# -------------------------------------------------------------------
+#  Favorites / watch-later toggles
+# -------------------------------------------------------------------
+
+@async_api_view(["POST"], authentication=ClaimsJWTAuthentication, login_required=True)
+async def add_favorite(request):
+    _dbg_show_auth(request)
+    movie_id = (_payload(request) or {}).get('movie_id')
+
+    if not movie_id:
+        return json_response({'error': 'Movie ID is required'}, status=400)
+
+    if await Favorite.objects.filter(user_id=request.user.id, movie_id=movie_id).aexists():
+        return json_response({'message': 'Already in favorites'}, status=400)
+
+    if not await Movie.objects.filter(id=movie_id).aexists():
+        return json_response({'error': 'Movie not found'}, status=404)
+
+    await Favorite.objects.acreate(user_id=request.user.id, movie_id=movie_id)
+    return json_response({'message': 'Added to favorites'})
+
+
+@async_api_view(["DELETE"], authentication=ClaimsJWTAuthentication, login_required=True)
+async def remove_favorite(request, movie_id):
+    _dbg_show_auth(request)
+    favorite = await aget_object_or_404(Favorite, user_id=request.user.id, movie__id=movie_id)
+    await favorite.adelete()
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+@async_api_view(["POST"], authentication=ClaimsJWTAuthentication, login_required=True)
+async def add_watchlater(request):
+    _dbg_show_auth(request)
+    movie_id = (_payload(request) or {}).get("movie_id")
+    if not movie_id:
+        return json_response({"error": "Movie ID required"}, status=400)
+
+    if await WatchLater.objects.filter(user_id=request.user.id, movie_id=movie_id).aexists():
+        return json_response({"message": "Already in watch-later"}, status=400)
+
+    await WatchLater.objects.acreate(user_id=request.user.id, movie_id=movie_id)
+    return json_response({"message": "Added to watch-later"})
+
+
+@async_api_view(["DELETE"], authentication=ClaimsJWTAuthentication, login_required=True)
+async def remove_watchlater(request, movie_id):
+    _dbg_show_auth(request)
+    item = await aget_object_or_404(WatchLater, user_id=request.user.id, movie_id=movie_id)
+    await item.adelete()
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+# -------------------------------------------------------------------
+#  Playback progress
+# -------------------------------------------------------------------
+
+async def _amovie_id_for_slug(slug):
+    key = f"movies:slug-id:{slug}"  # shared with views._movie_id_for_slug
+    movie_id = await cache.aget(key)
+    if movie_id is None:
+        movie_id = await Movie.objects.filter(slug=slug).values_list("id", flat=True).afirst()
+        if movie_id is not None:
+            await cache.aset(key, movie_id, 60 * 60)
+    return movie_id
+
+
+@async_api_view(["POST"], authentication=ClaimsJWTAuthentication, login_required=True)
+async def update_progress_slug(request, slug):
+    data = _payload(request)
+    position, error = parse_position(data)
+    if error:
+        return json_response({"error": error}, status=400)
+
+    if settings.PROGRESS_COALESCE:
+        movie_id = await _amovie_id_for_slug(slug)
+        if movie_id is None:
+            raise Http404
+        # record() may trigger a flush, which writes to the database.
+        await sync_to_async(progress_buffer.record)(request.user.id, movie_id, position)
+        if data.get("event") in PROGRESS_FLUSH_EVENTS:
+            await sync_to_async(progress_buffer.flush)()
+        return json_response({"success": True, "position": position})
+
+    movie = await aget_object_or_404(Movie, slug=slug)
+    row, _ = await PlaybackProgress.objects.aupdate_or_create(
+        user_id=request.user.id,
+        movie=movie,
+        defaults={"position": position},
+    )
+    return json_response({"success": True, "position": row.position})
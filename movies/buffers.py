@@ -0,0 +1,177 @@
+# movies/buffers.py
+"""
+In-process write-behind buffers for hot counters.
+
+Requests only touch a dict under a lock; a background flush turns whatever
+accumulated into one bulk statement every ``flush_interval`` seconds or
+``max_pending`` events, whichever comes first, and once more at interpreter
+exit so a recycled worker doesn't drop what it was holding. A failed flush
+is kept for the next one, except entries the database rejects outright
+(integrity or data errors), which are logged and dropped.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Movie, PlaybackProgress
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, flush_interval, max_pending):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._events = 0
+        self._timer = None
+        atexit.register(self.flush)
+
+    # -- subclass hooks --------------------------------------------------
+
+    def merge(self, pending, key, value):
+        """Fold ``value`` into ``pending[key]``."""
+        raise NotImplementedError
+
+    def write(self, batch):
+        """Persist ``{key: value}`` in as few statements as possible."""
+        raise NotImplementedError
+
+    # -- public API ------------------------------------------------------
+
+    def add(self, key, value):
+        with self._lock:
+            self.merge(self._pending, key, value)
+            self._events += 1
+            due = self._events >= self.max_pending
+            if not due:
+                self._ensure_timer()
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:  # one writer at a time keeps row lock order stable
+            with self._lock:
+                batch, self._pending, self._events = self._pending, {}, 0
+            if not batch:
+                return
+            try:
+                self.write(batch)
+            except (IntegrityError, DataError):
+                # Some entry can never be written (say its movie was deleted
+                # while it sat here): find it rather than retry the batch forever.
+                self._write_each(batch)
+            except Exception:
+                logger.exception("%s flush failed; keeping %d entries for retry",
+                                 type(self).__name__, len(batch))
+                self._requeue(batch)
+
+    def _write_each(self, batch):
+        retry = {}
+        for key, value in batch.items():
+            try:
+                self.write({key: value})
+            except (IntegrityError, DataError):
+                logger.exception("%s dropping %r=%r: rejected by the database",
+                                 type(self).__name__, key, value)
+            except Exception:
+                retry[key] = value
+        if retry:
+            logger.error("%s flush failed; keeping %d entries for retry", type(self).__name__, len(retry))
+            self._requeue(retry)
+
+    def _requeue(self, batch):
+        with self._lock:
+            for key, value in batch.items():
+                self.merge(self._pending, key, value)
+
+    # -- background flushing --------------------------------------------
+
+    def _ensure_timer(self):
+        # Started lazily (under self._lock) so each forked worker gets its own thread.
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._timer.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            connection.close()  # this thread's connection only
+
+
+class ViewCountBuffer(WriteBehindBuffer):
+    """Sums plays per movie slug and adds them to ``Movie.views`` in bulk."""
+
+    chunk_size = 1000
+
+    def merge(self, pending, key, value):
+        pending[key] = pending.get(key, 0) + value
+
+    def write(self, batch):
+        items = sorted(batch.items())
+        if connection.vendor != "postgresql":
+            with transaction.atomic():
+                for slug, count in items:
+                    Movie.objects.filter(slug=slug).update(views=F("views") + count)
+            return
+
+        table = Movie._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:  # all chunks or none, so a retry can't double-count
+            for start in range(0, len(items), self.chunk_size):
+                chunk = items[start:start + self.chunk_size]
+                values = ", ".join(["(%s, %s)"] * len(chunk))
+                cursor.execute(
+                    f"UPDATE {table} AS m SET views = m.views + v.n "
+                    f"FROM (VALUES {values}) AS v(slug, n) WHERE m.slug = v.slug",
+                    [param for pair in chunk for param in pair],
+                )
+
+
+class ProgressBuffer(WriteBehindBuffer):
+    """
+    Coalesces player heartbeats: keeps only the latest position per
+    (user_id, movie_id) and upserts them with one INSERT ... ON CONFLICT.
+    """
+
+    def merge(self, pending, key, value):
+        current = pending.get(key)
+        if current is None or value[1] >= current[1]:  # (position, recorded_at)
+            pending[key] = value
+
+    def pending_for_user(self, user_id):
+        with self._lock:
+            return {movie_id: value for (uid, movie_id), value in self._pending.items() if uid == user_id}
+
+    def write(self, batch):
+        rows = [PlaybackProgress(user_id=user_id, movie_id=movie_id, position=position)
+                for (user_id, movie_id), (position, _) in batch.items()]
+        with transaction.atomic():
+            PlaybackProgress.objects.bulk_create(
+                sorted(rows, key=lambda r: (r.user_id, r.movie_id)),
+                update_conflicts=True,
+                unique_fields=["user", "movie"],
+                update_fields=["position", "updated_at"],
+            )
+
+    def record(self, user_id, movie_id, position):
+        self.add((user_id, movie_id), (position, timezone.now()))
+
+
+view_counter = ViewCountBuffer(
+    flush_interval=settings.VIEW_COUNTER_FLUSH_SECONDS,
+    max_pending=settings.VIEW_COUNTER_MAX_EVENTS,
+)
+
+progress_buffer = ProgressBuffer(
+    flush_interval=settings.PROGRESS_FLUSH_SECONDS,
+    max_pending=settings.PROGRESS_MAX_EVENTS,
+)
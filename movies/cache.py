@@ -0,0 +1,104 @@
+# movies/cache.py
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+CATALOG_VERSION_KEY = "movies:catalog-version"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a cache flush never resurrects an old version.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        return cache.incr(key)
+    except ValueError:  # key missing or evicted
+        _get_version(key)
+        return cache.incr(key)
+
+
+def get_catalog_version():
+    """
+    Current catalog version. Any change to Movie rows bumps it, which retires
+    every cached catalog response at once (old keys simply stop being read).
+    """
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+async def aget_catalog_version():
+    return await _aget_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    return _bump_version(CATALOG_VERSION_KEY)
+
+
+def request_fingerprint(request):
+    """
+    Hash of path + normalized query string + Accept header, i.e. everything
+    that changes the rendered body of a public catalog GET. Parameters are
+    sorted so ``?a=1&b=2`` and ``?b=2&a=1`` match.
+    """
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw = "|".join([request.path, query, request.META.get("HTTP_ACCEPT", "")])
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def catalog_cache_key(request, prefix="catalog"):
+    return f"movies:{prefix}:{get_catalog_version()}:{request_fingerprint(request)}"
+
+
+async def acatalog_cache_key(request, prefix="catalog"):
+    return f"movies:{prefix}:{await aget_catalog_version()}:{request_fingerprint(request)}"
+
+
+class CatalogCacheMixin:
+    """
+    Serve anonymous GETs of public catalog views from the cache.
+
+    Only requests without an Authorization header are cached, so token
+    errors still surface normally. Responses are stored rendered, so a hit
+    skips the database, serialization and rendering entirely.
+    """
+    catalog_cache_timeout = None  # defaults to settings.CATALOG_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "GET" or "HTTP_AUTHORIZATION" in request.META:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = catalog_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            if "ETag" in headers:
+                not_modified = get_conditional_response(request, etag=headers["ETag"])
+                if not_modified is not None:
+                    return not_modified
+            return HttpResponse(content, headers=headers)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if hasattr(response, "render"):
+                response.render()
+            timeout = self.catalog_cache_timeout or settings.CATALOG_CACHE_TIMEOUT
+            cache.set(key, (response.content, dict(response.items())), timeout)
+        return response
@@ -0,0 +1,84 @@
+# movies/conditional.py
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import request_fingerprint
+from .stats import COUNTERS
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for Movie list and detail views.
+
+    The validator comes from one cheap query (``MAX(updated_at)``, row count
+    and the sums of ``validator_counters`` for lists, the row's
+    ``updated_at`` and counters for details) and is checked against
+    If-None-Match / If-Modified-Since before anything is serialized, so an
+    unchanged catalog costs a single aggregate and an empty 304.
+    """
+    validator_field = "updated_at"
+    validator_counters = COUNTERS  # columns that change without touching validator_field
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(**list_aggregates(self.validator_field, self.validator_counters))
+        return self._conditional(
+            request, stats["last_modified"], list_token(stats, self.validator_counters),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = (self.get_queryset()
+               .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+               .values_list("pk", self.validator_field, *self.validator_counters)
+               .first())
+        if row is None:
+            return super().retrieve(request, *args, **kwargs)  # regular 404
+        pk, last_modified, *counters = row
+        return self._conditional(
+            request, last_modified, "|".join(map(str, [pk, *counters])),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def _conditional(self, request, last_modified, token, build_response):
+        etag, timestamp = validators(request, last_modified, token)
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build_response()
+        return apply_validators(response, etag, timestamp)
+
+
+def list_aggregates(validator_field, counters):
+    """``aggregate()`` arguments for a list validator; see ``list_token``."""
+    return {
+        "last_modified": Max(validator_field),
+        "count": Count("pk"),
+        **{f"{name}_total": Sum(name) for name in counters},
+    }
+
+
+def list_token(stats, counters):
+    return "|".join(str(stats[key]) for key in ["count", *(f"{name}_total" for name in counters)])
+
+
+def validators(request, last_modified, token):
+    """``(etag, last_modified timestamp)`` for a row's or list's validator values."""
+    stamp = last_modified.isoformat() if last_modified else "-"
+    raw = f"{stamp}|{token}|{request_fingerprint(request)}"
+    etag = '"%s"' % hashlib.md5(raw.encode("utf-8")).hexdigest()
+    timestamp = last_modified.timestamp() if last_modified else None
+    return etag, timestamp
+
+
+def apply_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        # Let browsers keep the body but revalidate it on every use.
+        patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,71 @@
+# movies/facets.py
+"""
+Facet counts for catalog navigation: movies per genre, per decade and per
+runtime bucket, in two ``GROUP BY`` queries. Genres are counted over the
+``MovieGenre`` links, the same rows ``?genre=`` filters on, so a film
+appears under each of its genres; decades and runtime buckets come from one
+grouping over (decade, bucket), rolled up in Python.
+"""
+from collections import Counter
+
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+
+from .models import MovieGenre
+
+# (key, min minutes inclusive, max minutes exclusive)
+RUNTIME_BUCKETS = [
+    ("under-60", None, 60),
+    ("60-89", 60, 90),
+    ("90-119", 90, 120),
+    ("120-plus", 120, None),
+]
+UNKNOWN = "unknown"
+
+
+def _runtime_bucket():
+    whens = []
+    for key, low, high in RUNTIME_BUCKETS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(runtime_minutes__gte=low)
+        if high is not None:
+            condition &= Q(runtime_minutes__lt=high)
+        whens.append(When(condition, then=Value(key)))  # NULL runtimes match none
+    return Case(*whens, default=Value(UNKNOWN), output_field=CharField())
+
+
+def facet_counts(queryset):
+    queryset = queryset.order_by()
+    rows = (
+        queryset
+        .annotate(
+            decade=F("year") / 10 * 10,  # integer division
+            runtime_bucket=_runtime_bucket(),
+        )
+        .values("decade", "runtime_bucket")
+        .annotate(n=Count("pk"))
+    )
+    genres = (
+        MovieGenre.objects.filter(movie__in=queryset.values("pk"))
+        .values("genre__name", "genre__slug")
+        .annotate(n=Count("movie_id"))
+        .order_by("-n", "genre__name")
+    )
+
+    decades, buckets = Counter(), Counter()
+    for row in rows:
+        decades[row["decade"]] += row["n"]
+        buckets[row["runtime_bucket"]] += row["n"]
+
+    return {
+        "total": sum(decades.values()),
+        "genres": [{"genre": row["genre__name"], "slug": row["genre__slug"], "count": row["n"]}
+                   for row in genres],
+        "decades": [{"decade": decade, "count": n}
+                    for decade, n in sorted(decades.items(), key=lambda kv: (kv[0] is None, kv[0] or 0))],
+        "runtime": [
+            {"bucket": key, "min": low, "max": high - 1 if high else None, "count": buckets[key]}
+            for key, low, high in RUNTIME_BUCKETS
+        ] + ([{"bucket": UNKNOWN, "min": None, "max": None, "count": buckets[UNKNOWN]}]
+             if buckets[UNKNOWN] else []),
+    }
@@ -0,0 +1,46 @@
+# movies/filters.py
+from django import forms
+from django.db.models import Exists, OuterRef
+from django_filters import rest_framework as filters
+
+from .models import Movie, MovieGenre
+from .snapshot import genre_key
+
+
+class MultipleValueField(forms.Field):
+    widget = forms.SelectMultiple  # reads every repeated ?name= value (QueryDict.getlist)
+
+    def to_python(self, value):
+        return [v.strip() for v in value or () if v.strip()]
+
+
+class MultipleValueFilter(filters.Filter):
+    field_class = MultipleValueField
+
+
+class MovieFilter(filters.FilterSet):
+    """
+    ``?genre=`` / ``?is_featured=`` as before, plus inclusive ranges on the
+    indexed year and runtime columns: ``?year__range=1980,1989`` and
+    ``?runtime_minutes__range=90,120``.
+
+    ``?genre=`` may repeat (``?genre=Horror&genre=Western``) and matches
+    movies linked to any of the genres, by slug.
+    """
+    genre = MultipleValueFilter(method="filter_genre")
+
+    class Meta:
+        model = Movie
+        fields = {
+            "is_featured": ["exact"],
+            "year": ["range"],
+            "runtime_minutes": ["range"],
+        }
+
+    def filter_genre(self, queryset, name, value):
+        # A semi-join on the through table's (genre, movie) index: no text
+        # matching, and a movie in several of the genres still comes back once.
+        slugs = {genre_key(v) for v in value}
+        return queryset.filter(Exists(
+            MovieGenre.objects.filter(movie=OuterRef("pk"), genre__slug__in=slugs)
+        ))
@@ -0,0 +1,137 @@
+# movies/genres.py
+"""
+Normalized genres: ``Genre`` rows linked to movies through ``MovieGenre``.
+
+``Movie.genre`` stays the primary genre (search vector, admin); the links
+hold every genre a film was found under and drive ``?genre=``, the genre
+facet counts and the snapshot shards. Genres are keyed by slug
+(``genre_key``), so ``?genre=Sci-Fi`` and ``?genre=sci-fi`` name the same
+row. Adding or removing a link touches the movie's ``updated_at``, which the
+ETags and the snapshot stamp are built from.
+
+Links made for ``Movie.genre`` are flagged ``from_primary`` and replaced by
+``set_primary_genre`` when it changes; links that ``link_genres`` adds
+(the importer) stay, and take over a primary link for the same genre.
+
+``genre_rows`` builds the home page's per-genre rows in one query: a
+``ROW_NUMBER()`` window over the through table keeps the top movies of each
+genre, and a ``COUNT(*)`` window over the same partition gives the row
+totals.
+"""
+from itertools import groupby
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .models import Genre, Movie, MovieGenre
+from .snapshot import genre_key
+
+
+def _find_genre(name, slug):
+    # By slug first; an admin may have saved the same name under another slug.
+    return Genre.objects.filter(slug=slug).first() or Genre.objects.filter(name__iexact=name).first()
+
+
+def genre_for(name):
+    """The Genre for a free-text genre name, created on first use."""
+    name, slug = name.strip(), genre_key(name)
+    genre = _find_genre(name, slug)
+    if genre is None:
+        try:
+            with transaction.atomic():
+                genre = Genre.objects.create(name=name, slug=slug)
+        except IntegrityError:  # created concurrently
+            genre = _find_genre(name, slug)
+    return genre
+
+
+def _chunks(ids, size=1000):
+    ids = sorted(ids)
+    return (ids[start:start + size] for start in range(0, len(ids), size))
+
+
+def _touch(movie_ids):
+    now = timezone.now()
+    for chunk in _chunks(movie_ids):
+        Movie.objects.filter(pk__in=chunk).update(updated_at=now)
+
+
+def link_genres(pairs, primary=False):
+    """
+    Attach genres to movies in bulk. ``pairs`` are (movie_id, genre name);
+    links that already exist are kept. ``primary`` marks links made for
+    ``Movie.genre``; see the module docstring.
+    """
+    pairs = [(movie_id, name) for movie_id, name in pairs if name and name.strip()]
+    if not pairs:
+        return
+    genres = {name: genre_for(name) for name in {name for _, name in pairs}}
+    _link({(movie_id, genres[name].pk) for movie_id, name in pairs}, primary)
+
+
+def _link(wanted, primary):
+    # Movies that gain a link are touched, and since ``bulk_create`` sends no
+    # signals, this bumps the catalog version itself.
+    genre_ids = {genre_id for _, genre_id in wanted}
+    existing = {}
+    for chunk in _chunks({movie_id for movie_id, _ in wanted}):
+        rows = (MovieGenre.objects.filter(movie_id__in=chunk, genre_id__in=genre_ids)
+                .values_list("movie_id", "genre_id", "from_primary"))
+        existing.update(((movie_id, genre_id), flag) for movie_id, genre_id, flag in rows)
+    new = wanted - existing.keys()
+    adopted = set() if primary else {key for key in wanted & existing.keys() if existing[key]}
+    if not new and not adopted:
+        return  # e.g. a re-import: nothing to write or invalidate
+    if primary:
+        conflicts = {"ignore_conflicts": True}
+    else:
+        conflicts = {"update_conflicts": True, "unique_fields": ["movie", "genre"], "update_fields": ["from_primary"]}
+    MovieGenre.objects.bulk_create(
+        [MovieGenre(movie_id=movie_id, genre_id=genre_id, from_primary=primary)
+         for movie_id, genre_id in sorted(new | adopted)],
+        batch_size=1000, **conflicts,
+    )
+    if new:
+        _touch({movie_id for movie_id, _ in new})
+        transaction.on_commit(bump_catalog_version)
+
+
+def set_primary_genre(movie_id, name):
+    """Link ``name`` as the movie's primary genre, dropping the primary link it replaces."""
+    genre = genre_for(name) if name and name.strip() else None
+    stale = MovieGenre.objects.filter(movie_id=movie_id, from_primary=True)
+    if genre is not None:
+        stale = stale.exclude(genre=genre)
+    deleted, _ = stale.delete()
+    if deleted:
+        _touch([movie_id])
+    if genre is not None:
+        _link({(movie_id, genre.pk)}, primary=True)
+
+
+def genre_rows(movie_columns, per_genre, slugs=None):
+    """
+    ``[(genre, total, [movie, …]), …]``, largest genres first, each with its
+    ``per_genre`` most viewed movies (only ``movie_columns`` loaded).
+    """
+    links = MovieGenre.objects.all()
+    if slugs:
+        links = links.filter(genre__slug__in=slugs)
+    links = (
+        links.annotate(
+            position=Window(RowNumber(), partition_by=F("genre_id"),
+                            order_by=[F("movie__views").desc(), F("movie_id").asc()]),
+            total=Window(Count("id"), partition_by=F("genre_id")),
+        )
+        .filter(position__lte=per_genre)
+        .select_related("genre", "movie")
+        .only("genre__name", "genre__slug", *(f"movie__{c}" for c in movie_columns))
+        .order_by("-total", "genre__name", "position")
+    )
+    return [
+        (genre, rows[0].total, [row.movie for row in rows])
+        for genre, rows in ((genre, list(rows)) for genre, rows in groupby(links, key=lambda row: row.genre))
+    ]
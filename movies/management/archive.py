@@ -0,0 +1,106 @@
+# movies/management/archive.py
+"""
+HTTP side of the archive.org importer (import_movies_from_archive).
+
+Every worker thread goes through one ``ArchiveClient``: a shared token
+bucket caps the request rate whatever the worker count, and 429 / 5xx
+answers (or dropped connections) are retried with exponential backoff. A
+429 also drains the bucket, so all workers back off together rather than
+each finding out on its own.
+"""
+import random
+import threading
+import time
+
+import requests
+
+SEARCH_URL = "https://archive.org/advancedsearch.php"
+METADATA_URL = "https://archive.org/metadata/{identifier}"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 60  # seconds; don't let one header stall the import
+
+
+class TokenBucket:
+    """
+    At most ``rate`` requests per second on average, bursts up to
+    ``burst``. ``acquire()`` blocks until a token is free.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def drain(self, seconds):
+        """No tokens for anyone for the next ``seconds``."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class ArchiveClient:
+    def __init__(self, rate, burst=None, retries=4, backoff=1.0, timeout=15):
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        # requests.Session isn't thread-safe: one per worker, each keeping its connections alive.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def get_json(self, url, params=None):
+        """GET and decode JSON, retrying transient failures; raises once retries run out."""
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            delay = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.json()
+                delay = _retry_after(response)
+                if response.status_code == 429:
+                    self.bucket.drain(delay or self.backoff * 2 ** attempt)
+            # Full jitter keeps the workers from retrying in lockstep.
+            time.sleep(delay if delay is not None else random.uniform(0, self.backoff * 2 ** attempt))
+
+    def search(self, query, page, rows=50, fields=("identifier", "title", "description", "year")):
+        params = {"q": query, "fl[]": list(fields), "rows": rows, "page": page, "output": "json"}
+        return self.get_json(SEARCH_URL, params).get("response", {}).get("docs", [])
+
+    def metadata(self, identifier):
+        return self.get_json(METADATA_URL.format(identifier=identifier))
+
+
+def _retry_after(response):
+    try:
+        return min(float(response.headers["Retry-After"]), MAX_RETRY_AFTER)
+    except (KeyError, ValueError):
+        return None  # missing, or the HTTP-date form
@@ -0,0 +1,38 @@
+# movies/management/base.py
+from django.core.management.base import BaseCommand
+
+from movies.cache import bump_catalog_version
+from movies.sitemaps import read_sitemap_manifest, write_sitemaps
+from movies.snapshot import read_manifest, snapshot_stamp, write_catalog_snapshot
+
+
+class CatalogCommand(BaseCommand):
+    """
+    Base for management commands that write Movie rows. When the command
+    finishes (even on failure, since earlier rows may already be written) it
+    bumps the catalog version so cached catalog responses are rebuilt. After
+    a successful run it also republishes the static catalog snapshot and
+    sitemaps, unless the catalog is unchanged since they were built; after
+    a failed one the endpoints rebuild them in the background on next use.
+    """
+
+    def execute(self, *args, **options):
+        try:
+            result = super().execute(*args, **options)
+        finally:
+            bump_catalog_version()
+        self.publish_catalog()
+        return result
+
+    def publish_catalog(self):
+        stamp = snapshot_stamp()
+        builds = (("Catalog snapshot", read_manifest, write_catalog_snapshot),
+                  ("Sitemaps", read_sitemap_manifest, write_sitemaps))
+        for label, read, build in builds:
+            # Both endpoints also rebuild lazily, so don't fail the command.
+            try:
+                manifest = read()
+                if manifest is None or manifest["version"] != stamp:
+                    build(stamp)
+            except Exception as e:
+                self.stderr.write(self.style.WARNING(f"{label} not rebuilt: {e}"))
@@ -0,0 +1,64 @@
+# movies/management/bench.py
+"""
+Shared pieces of the benchmark commands (bench_catalog, bench_async_views):
+the closed-loop driver and the latency / query-count summary.
+"""
+import asyncio
+import itertools
+import re
+import time
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return None
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def queries_from_server_timing(header):
+    """Query count from our ``Server-Timing`` header (backend_api/timing.py), or None."""
+    match = _QUERIES.search(header or "")
+    return int(match.group(1)) if match else None
+
+
+async def drive(call, total, concurrency):
+    """
+    Closed loop: ``concurrency`` clients each send their next request when
+    the last one returns. ``call(i)`` is awaited for i in range(total) and
+    returns ``(status_code, queries or None)``.
+    """
+    counter = itertools.count()
+    samples = []
+
+    async def client():
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            status_code, queries = await call(i)
+            samples.append((time.perf_counter() - start, status_code, queries))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency for latency, _, _ in samples)
+    queries = [q for _, _, q in samples if q is not None]
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    return {
+        "requests": len(samples),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "errors": sum(1 for _, status_code, _ in samples if status_code >= 500),
+        "non_2xx": sum(1 for _, status_code, _ in samples if not 200 <= status_code < 300),
+        "queries_avg": round(sum(queries) / len(queries), 2) if queries else None,
+        "queries_max": max(queries) if queries else None,
+    }
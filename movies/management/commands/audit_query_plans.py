@@ -0,0 +1,167 @@
+# movies/management/commands/audit_query_plans.py
+
+import json
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count
+from django.test import Client
+
+from accounts.jwt import VerifiedEmailTokenSerializer
+from movies.models import Comment, Genre, Movie, PlaybackProgress, WatchLater
+from movies.snapshot import genre_key
+
+# sort_ok: the ORDER BY has no index to follow (search rank), so a Sort node
+# is expected there; a sequential scan never is.
+Endpoint = namedtuple("Endpoint", "name path sort_ok")
+
+ENDPOINTS = [
+    Endpoint("hero", "/api/movies/hero-movies/", False),
+    Endpoint("movie-list", "/api/movies/?page_size=24", False),
+    Endpoint("movie-list-genre", "/api/movies/?genre={genre}&page_size=24", False),
+    Endpoint("movie-list-genres", "/api/movies/?genre={genre}&genre={other_genre}&page_size=24", False),
+    Endpoint("featured", "/api/movies/?is_featured=true&page_size=24", False),
+    Endpoint("featured-genre", "/api/movies/?is_featured=true&genre={genre}&page_size=24", False),
+    Endpoint("movie-detail", "/api/movies/{slug}/", False),
+    Endpoint("comments", "/api/movies/{slug}/comments/", False),
+    Endpoint("comments-page", "/api/movies/{slug}/comments/?page_size=20", False),
+    Endpoint("favorites", "/api/movies/favorites/", False),
+    Endpoint("watchlater", "/api/movies/watchlater/", False),
+    Endpoint("progress", "/api/movies/progress/", False),
+    Endpoint("library", "/api/movies/library/", False),
+    Endpoint("search", "/api/movies/?search={word}&page_size=24", True),
+]
+
+
+class Command(BaseCommand):
+    help = ("EXPLAIN every SELECT the hot movie endpoints run against the current (seeded) "
+            "PostgreSQL database and fail if a sequential scan or a sort shows up on an "
+            "indexed path.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", action="append", help="Audit only these (repeatable). Default: all.")
+        parser.add_argument("--username", help="User whose library is audited. Default: the one with "
+                                               "the most watch-later rows.")
+        parser.add_argument("--output", help="Also write every statement and its plan to this JSON file.")
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "postgresql":
+            raise CommandError("Query plans are only audited on PostgreSQL.")
+        movie = (Movie.objects.exclude(slug=None).exclude(genre="")
+                 .filter(comment_count__gt=0).order_by("-comment_count").first()
+                 or Movie.objects.exclude(slug=None).exclude(genre="").first())
+        user = self._user(options["username"])
+        if movie is None or user is None:
+            raise CommandError("Nothing to audit; seed a catalog first (`manage.py seed_bench_catalog`).")
+        if not (WatchLater.objects.filter(user=user).exists() and PlaybackProgress.objects.filter(user=user).exists()
+                and Comment.objects.filter(movie=movie).exists()):
+            self.stdout.write(self.style.WARNING("  some per-user / per-movie lists are empty; "
+                                                 "their plans may not be representative"))
+
+        endpoints = ENDPOINTS
+        if options["endpoint"]:
+            unknown = set(options["endpoint"]) - {e.name for e in endpoints}
+            if unknown:
+                raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+            endpoints = [e for e in endpoints if e.name in options["endpoint"]]
+
+        # Authenticated requests skip the catalog cache, so every view really queries.
+        token = str(VerifiedEmailTokenSerializer.get_token(user).access_token)
+        client = Client(raise_request_exception=False, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        other_genre = (Genre.objects.exclude(slug=genre_key(movie.genre)).values_list("slug", flat=True).first()
+                       or movie.genre)
+        values = {"slug": movie.slug, "genre": quote(movie.genre), "other_genre": quote(other_genre),
+                  "word": quote(movie.title.split()[0])}
+
+        report, failures = {}, 0
+        for endpoint in endpoints:
+            path = endpoint.path.format(**values)
+            with self.capture() as statements:
+                response = client.get(path, headers={"Authorization": f"Bearer {token}"}, secure=True)
+            if response.status_code != 200:
+                raise CommandError(f"{endpoint.name}: GET {path} returned {response.status_code}")
+
+            entries, problems = [], []
+            for alias, sql, params in statements:
+                plan, found = self.explain(alias, sql, params)
+                found = [p for p in found if not (endpoint.sort_ok and p.startswith("sort"))]
+                problems += found
+                entries.append({"database": alias, "sql": sql, "plan": plan, "problems": found})
+            report[endpoint.name] = {"path": path, "statements": entries}
+
+            failures += bool(problems)
+            mark = self.style.ERROR("FAIL") if problems else self.style.SUCCESS("PASS")
+            self.stdout.write(f"  {mark} {endpoint.name:<17} {len(statements)} statement(s)")
+            for problem in problems:
+                self.stdout.write(f"       {problem}")
+            if options["verbosity"] > 1:
+                for entry in entries:
+                    self.stdout.write(f"       {entry['sql']}\n         " + "\n         ".join(entry["plan"]))
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Plans written to {options['output']}"))
+        if failures:
+            raise CommandError(f"{failures} endpoint(s) scan or sort where an index should be used.")
+        self.stdout.write(self.style.SUCCESS("✅ Every audited query uses an index."))
+
+    @staticmethod
+    def _user(username):
+        if username:
+            return User.objects.filter(username=username).first()
+        top = (WatchLater.objects.values("user").order_by().annotate(n=Count("id"))
+               .order_by("-n").values_list("user", flat=True).first())
+        return User.objects.filter(pk=top).first() if top else User.objects.order_by("id").first()
+
+    @contextmanager
+    def capture(self):
+        """Collect (alias, sql, params) of every SELECT run inside the block."""
+        statements = []
+
+        def wrapper(execute, sql, params, many, context):
+            if not many and sql.lstrip().upper().startswith("SELECT"):
+                statements.append((context["connection"].alias, sql, params))
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(wrapper))
+            yield statements
+
+    @staticmethod
+    def explain(alias, sql, params):
+        """Return (plan lines, problems) for one statement."""
+        # Small seeded tables fit in a page or two, where a seq scan is the
+        # cheapest plan whatever the indexes. Pricing scans and sorts out
+        # leaves them only where no index can do the job.
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        lines, problems = [], []
+
+        def walk(node, depth):
+            kind = node["Node Type"]
+            relation = node.get("Relation Name")
+            index = node.get("Index Name")
+            lines.append("  " * depth + kind + (f" on {relation}" if relation else "")
+                         + (f" using {index}" if index else ""))
+            if kind == "Seq Scan":
+                problems.append(f"seq scan on {relation}")
+            elif kind in ("Sort", "Incremental Sort"):
+                problems.append(f"sort ({kind}: {', '.join(node.get('Sort Key', []))})")
+            for child in node.get("Plans", []):
+                walk(child, depth + 1)
+
+        walk(plan[0]["Plan"], 0)
+        return lines, problems
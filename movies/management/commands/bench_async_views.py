@@ -0,0 +1,143 @@
+# movies/management/commands/bench_async_views.py
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncRequestFactory, RequestFactory
+
+from accounts.jwt import VerifiedEmailTokenSerializer
+from movies import async_views, views
+from movies.management.bench import drive
+from movies.models import Favorite, Movie, PlaybackProgress, WatchLater
+
+
+def delayed_sql(delay):
+    """execute_wrapper that adds ``delay`` seconds to every statement (a slow database)."""
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+class Command(BaseCommand):
+    help = ("Compare requests/sec and p50/p99 latency of the sync DRF views and "
+            "their native async versions (movies/async_views.py), in-process.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and mode.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients.")
+        parser.add_argument("--sync-workers", type=int, default=4,
+                            help="Threads serving the sync views (stands in for gunicorn sync workers).")
+        parser.add_argument("--db-delay", type=float, default=0.0,
+                            help="Extra milliseconds per SQL statement, to model a slow database.")
+        parser.add_argument("--user", default="bench-async", help="Username to authenticate as (created if missing).")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        movies = list(Movie.objects.exclude(slug=None).order_by("id").values_list("id", "slug")[:options["concurrency"] * 2])
+        if not movies:
+            raise CommandError("No movies with slugs to benchmark against.")
+        user, _ = User.objects.get_or_create(username=options["user"], defaults={"is_active": True})
+        token = str(VerifiedEmailTokenSerializer.get_token(user).access_token)
+        auth = {"headers": {"Authorization": f"Bearer {token}"}}
+        self.delay = options["db_delay"] / 1000
+
+        # Authenticated reads skip the catalog cache, so the views really run.
+        endpoints = {
+            "hero-movies": (
+                views.HeroCarouselMovies.as_view(), async_views.hero_movies,
+                lambda f, i: (f.get("/api/movies/hero-movies/", **auth), {}),
+            ),
+            "movie-detail": (
+                views.MovieDetailSlug.as_view(), async_views.movie_detail_slug,
+                lambda f, i: (f.get(f"/api/movies/{movies[i % len(movies)][1]}/", **auth),
+                              {"slug": movies[i % len(movies)][1]}),
+            ),
+            "progress-update": (
+                views.update_progress_slug, async_views.update_progress_slug,
+                lambda f, i: (f.post(f"/api/movies/progress/update/{movies[i % len(movies)][1]}/",
+                                     {"position": i}, content_type="application/json", **auth),
+                              {"slug": movies[i % len(movies)][1]}),
+            ),
+            "favorite-add": (
+                views.add_favorite, async_views.add_favorite,
+                lambda f, i: (f.post("/api/movies/favorites/add/", {"movie_id": movies[i % len(movies)][0]},
+                                     content_type="application/json", **auth), {}),
+            ),
+            "watchlater-add": (
+                views.add_watchlater, async_views.add_watchlater,
+                lambda f, i: (f.post("/api/movies/watchlater/add/", {"movie_id": movies[i % len(movies)][0]},
+                                     content_type="application/json", **auth), {}),
+            ),
+        }
+
+        results = {}
+        try:
+            for name, (sync_view, async_view, build) in endpoints.items():
+                for mode in ("sync", "async"):
+                    self._reset(user)
+                    if mode == "sync":
+                        run = self._run_sync(sync_view, build, options)
+                    else:
+                        run = self._run_async(async_view, build, options)
+                    results[f"{name}/{mode}"] = run
+                    self.stdout.write(
+                        f"  {name:<16} {mode:<5} {run['rps']:>9.1f} req/s   "
+                        f"p50 {run['p50_ms']:>8.1f} ms   p99 {run['p99_ms']:>8.1f} ms   "
+                        f"errors {run['errors']}"
+                    )
+        finally:
+            self._reset(user)
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump({"options": {k: options[k] for k in ("requests", "concurrency", "sync_workers", "db_delay")},
+                           "results": results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+
+    @staticmethod
+    def _reset(user):
+        for model in (Favorite, WatchLater, PlaybackProgress):
+            model.objects.filter(user=user).delete()
+
+    def _call_sync(self, view, build, i):
+        request, kwargs = build(RequestFactory(), i)
+        try:
+            with connections["default"].execute_wrapper(delayed_sql(self.delay)):
+                response = view(request, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+            return response.status_code, None
+        finally:
+            connections.close_all()  # this thread's connections only
+
+    async def _call_async(self, view, build, i):
+        request, kwargs = build(AsyncRequestFactory(), i)
+        # As ASGIHandler does per request: its own thread for sync_to_async calls.
+        async with ThreadSensitiveContext():
+            try:
+                with connections["default"].execute_wrapper(delayed_sql(self.delay)):
+                    response = await view(request, **kwargs)
+                return response.status_code, None
+            finally:
+                await sync_to_async(connections.close_all)()
+
+    def _run_sync(self, view, build, options):
+        with ThreadPoolExecutor(options["sync_workers"]) as pool:
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(drive(
+                    lambda i: asyncio.wrap_future(pool.submit(self._call_sync, view, build, i)),
+                    options["requests"], options["concurrency"]))
+            finally:
+                loop.close()
+
+    def _run_async(self, view, build, options):
+        return asyncio.run(drive(lambda i: self._call_async(view, build, i),
+                                 options["requests"], options["concurrency"]))
@@ -0,0 +1,149 @@
+# movies/management/commands/bench_catalog.py
+
+import asyncio
+import json
+import random
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from accounts.jwt import VerifiedEmailTokenSerializer
+from movies.management.bench import drive, queries_from_server_timing
+from movies.management.commands.seed_bench_catalog import GENRES, MOVIE_PREFIX, USER_PREFIX, WORDS
+from movies.models import Movie
+
+SCENARIOS = ["movie-list", "movie-list-genre", "search", "movie-detail", "favorites", "progress-update"]
+
+
+class Command(BaseCommand):
+    help = ("Drive the catalog endpoints against the synthetic catalog (seed_bench_catalog) and "
+            "write throughput, p50/p95/p99 latency and queries per request to a JSON file.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                            help="Run only these (repeatable). Default: all.")
+        parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario first.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--base-url", help="Hit a running server (e.g. http://127.0.0.1:8000) "
+                                               "instead of calling the app in-process.")
+        parser.add_argument("--anonymous-reads", action="store_true",
+                            help="Send catalog reads without a token, i.e. through the catalog cache.")
+        parser.add_argument("--token-users", type=int, default=200, help="Synthetic users to spread auth calls over.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", default="bench-catalog.json")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        slugs = list(Movie.objects.filter(archive_identifier__startswith=MOVIE_PREFIX)
+                     .order_by("id").values_list("slug", flat=True)[:20_000])
+        users = list(User.objects.filter(username__startswith=USER_PREFIX)
+                     .order_by("id")[:options["token_users"]])
+        if not slugs or not users:
+            raise CommandError("No synthetic catalog found; run `manage.py seed_bench_catalog` first.")
+        rng.shuffle(slugs)
+        tokens = [str(VerifiedEmailTokenSerializer.get_token(user).access_token) for user in users]
+
+        self.transport = self._remote(options["base_url"]) if options["base_url"] else self._in_process()
+        anonymous_reads = options["anonymous_reads"]
+
+        def user_token(i):
+            return tokens[i % len(tokens)]
+
+        def read_token(i):
+            return None if anonymous_reads else user_token(i)
+
+        page = {"page_size": 24}
+        builders = {
+            "movie-list": lambda i: ("GET", f"/api/movies/?{urlencode(page)}", None, read_token(i)),
+            "movie-list-genre": lambda i: ("GET", f"/api/movies/?{urlencode({'genre': GENRES[i % len(GENRES)], **page})}",
+                                           None, read_token(i)),
+            "search": lambda i: ("GET", f"/api/movies/?{urlencode({'search': WORDS[i % len(WORDS)], **page})}",
+                                 None, read_token(i)),
+            "movie-detail": lambda i: ("GET", f"/api/movies/{slugs[i % len(slugs)]}/", None, read_token(i)),
+            "favorites": lambda i: ("GET", "/api/movies/favorites/", None, user_token(i)),
+            "progress-update": lambda i: ("POST", f"/api/movies/progress/update/{slugs[i % len(slugs)]}/",
+                                          {"position": i}, user_token(i)),
+        }
+
+        results = {}
+        with ThreadPoolExecutor(options["concurrency"], thread_name_prefix="bench") as pool:
+            for name in options["scenario"] or SCENARIOS:
+                build = builders[name]
+                for total, offset in ((options["warmup"], 10_000_000), (options["requests"], 0)):
+                    loop = asyncio.new_event_loop()
+                    try:
+                        run = loop.run_until_complete(drive(
+                            lambda i: asyncio.wrap_future(pool.submit(self.transport, *build(i + offset))),
+                            total, options["concurrency"]))
+                    finally:
+                        loop.close()
+                results[name] = run
+                self.stdout.write(
+                    f"  {name:<17} {run['rps']:>8.1f} req/s  p50 {run['p50_ms']:>7.1f}  p95 {run['p95_ms']:>7.1f}  "
+                    f"p99 {run['p99_ms']:>7.1f} ms  queries {run['queries_avg']}  non-2xx {run['non_2xx']}"
+                )
+
+        report = {
+            "meta": {
+                "commit": self._commit(),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "target": options["base_url"] or "in-process",
+                "movies": Movie.objects.count(),
+                "options": {k: options[k] for k in ("requests", "warmup", "concurrency", "anonymous_reads", "seed")},
+            },
+            "results": results,
+        }
+        with open(options["output"], "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+
+    # -- transports: (method, path, json body, token) -> (status, queries) ------
+
+    def _in_process(self):
+        local = threading.local()
+
+        def call(method, path, body, token):
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = Client(raise_request_exception=False, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            if method == "GET":
+                response = client.get(path, headers=headers, secure=True)
+            else:
+                response = client.post(path, body, content_type="application/json", headers=headers, secure=True)
+            # Client doesn't read the query count, the Server-Timing header does.
+            return response.status_code, queries_from_server_timing(response.get("Server-Timing"))
+
+        return call
+
+    def _remote(self, base_url):
+        local = threading.local()
+
+        def call(method, path, body, token):
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = requests.Session()
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            response = session.request(method, base_url.rstrip("/") + path, json=body, headers=headers, timeout=30)
+            return response.status_code, queries_from_server_timing(response.headers.get("Server-Timing"))
+
+        return call
+
+    @staticmethod
+    def _commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                  text=True, cwd=settings.BASE_DIR, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,64 @@
+# movies/management/commands/bench_db_pool.py
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from backend_api.dbpool import pool_stats
+from movies.management.bench import drive
+
+
+class Command(BaseCommand):
+    help = ("Cold-burst connection latency: N requests arrive at once on fresh threads, each "
+            "checks out a connection, runs SELECT 1 and releases it as request_finished would. "
+            "Run once with DB_POOL=False and once with DB_POOL=True to compare.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst", type=int, default=50, help="Requests arriving at once.")
+        parser.add_argument("--rounds", type=int, default=3, help="Bursts; the first one is the cold one.")
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        pooled = getattr(connections[alias], "pool", None) is not None
+        if pooled:
+            # What backend_api.warmup does at worker boot: open the pool, let it fill to min_size.
+            connections[alias].ensure_connection()
+            close_old_connections()
+            connections[alias].pool.wait(timeout=30)
+
+        def request():
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                return 200, 1
+            finally:
+                close_old_connections()
+
+        rounds = []
+        for n in range(1, options["rounds"] + 1):
+            # New threads each round, i.e. no thread-local connection left over.
+            with ThreadPoolExecutor(options["burst"]) as pool:
+                loop = asyncio.new_event_loop()
+                try:
+                    run = loop.run_until_complete(drive(
+                        lambda i: asyncio.wrap_future(pool.submit(request)), options["burst"], options["burst"]))
+                finally:
+                    loop.close()
+            rounds.append(run)
+            self.stdout.write(f"  round {n}: p50 {run['p50_ms']:>8.1f} ms   p99 {run['p99_ms']:>8.1f} ms   "
+                              f"wall {run['seconds'] * 1000:>8.1f} ms")
+
+        stats = pool_stats().get(alias)
+        if stats:
+            self.stdout.write(f"  pool: {stats}")
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump({"pooled": pooled, "conn_max_age": settings.CONN_MAX_AGE,
+                           "burst": options["burst"], "rounds": rounds, "pool": stats}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
@@ -0,0 +1,14 @@
+# movies/management/commands/build_catalog_snapshot.py
+
+from django.core.management.base import BaseCommand
+from movies.snapshot import write_catalog_snapshot
+
+class Command(BaseCommand):
+    help = "Write the precompressed public catalog snapshot (whole catalog + per-genre shards)."
+
+    def handle(self, *args, **options):
+        manifest = write_catalog_snapshot()
+        self.stdout.write(f"Version {manifest['version']}: {manifest['count']} movies → {manifest['catalog']}")
+        for key, shard in sorted(manifest["genres"].items()):
+            self.stdout.write(f"  {shard['genre'] or '(none)'}: {shard['count']} → {shard['file']}")
+        self.stdout.write(self.style.SUCCESS("✅ Catalog snapshot published."))
@@ -0,0 +1,13 @@
+# movies/management/commands/build_sitemaps.py
+
+from django.core.management.base import BaseCommand
+from movies.sitemaps import write_sitemaps
+
+class Command(BaseCommand):
+    help = "Render the gzipped sitemap shards (10k movie URLs each) and publish their manifest."
+
+    def handle(self, *args, **options):
+        manifest = write_sitemaps()
+        for section, shard in manifest["sections"].items():
+            self.stdout.write(f"  {section}: {shard['count']} URLs → {shard['file']}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Sitemaps {manifest['version']} published."))
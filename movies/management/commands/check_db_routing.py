@@ -0,0 +1,87 @@
+# movies/management/commands/check_db_routing.py
+
+import uuid
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+
+from accounts.jwt import VerifiedEmailTokenSerializer
+from backend_api.db_router import pin_key
+from movies.models import Favorite, Movie
+
+CHECK_USER = "routing-check"
+
+
+class Command(BaseCommand):
+    help = ("Prove read-replica routing against the configured databases: catalog GETs read "
+            "from a replica, writes go to the primary, and a client's reads stick to the "
+            "primary right after its own write.")
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured; set DATABASE_REPLICA_URLS.")
+        movie = Movie.objects.using(DEFAULT_DB_ALIAS).exclude(slug=None).first()
+        if movie is None:
+            raise CommandError("Need at least one movie on the primary.")
+
+        user, _ = User.objects.db_manager(DEFAULT_DB_ALIAS).get_or_create(username=CHECK_USER)
+        token = str(VerifiedEmailTokenSerializer.get_token(user).access_token)
+        auth = {"Authorization": f"Bearer {token}"}
+        client = Client(raise_request_exception=False, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        failures = 0
+
+        def check(label, expected, method, path, **kwargs):
+            nonlocal failures
+            with self.capture() as aliases:
+                response = getattr(client, method)(path, secure=True, **kwargs)
+            if expected == "replica":
+                ok = bool(aliases) and aliases <= set(settings.DATABASE_REPLICAS)
+            else:
+                ok = aliases == {DEFAULT_DB_ALIAS}
+            failures += not ok
+            mark = self.style.SUCCESS("PASS") if ok else self.style.ERROR("FAIL")
+            self.stdout.write(f"  {mark} {label}: {response.status_code}, read from {sorted(aliases) or '-'}")
+            return response
+
+        try:
+            Favorite.objects.filter(user=user).delete()
+            cache.delete(pin_key(auth["Authorization"]))
+
+            # A unique query string misses the catalog cache, so the view really queries.
+            check("anonymous catalog GET", "replica", "get", f"/api/movies/hero-movies/?check={uuid.uuid4().hex}")
+            check("favorite toggle (write)", "primary", "post", "/api/movies/favorites/add/",
+                  data={"movie_id": movie.id}, content_type="application/json", headers=auth)
+            response = check("favorites right after the write", "primary", "get", "/api/movies/favorites/",
+                             headers=auth)
+            if response.status_code != 200 or not any(row["movie"]["id"] == movie.id for row in response.json()):
+                failures += 1
+                self.stdout.write(self.style.ERROR("  FAIL the new favorite is missing from the list"))
+
+            cache.delete(pin_key(auth["Authorization"]))  # as if REPLICA_STICKY_SECONDS had passed
+            check("favorites once the pin expired", "replica", "get", "/api/movies/favorites/", headers=auth)
+        finally:
+            Favorite.objects.filter(user=user).delete()
+            user.delete()
+
+        if failures:
+            raise CommandError(f"{failures} routing check(s) failed.")
+        self.stdout.write(self.style.SUCCESS("✅ Replica routing works."))
+
+    @contextmanager
+    def capture(self):
+        """Collect the aliases that ran a statement inside the block."""
+        aliases = set()
+
+        def wrapper(execute, sql, params, many, context):
+            aliases.add(context["connection"].alias)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(wrapper))
+            yield aliases
@@ -1,10 +1,10 @@
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 import os
 import subprocess
 from django.conf import settings
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Convert all .avi movie files to .mp4"
 
     def handle(self, *args, **kwargs):
@@ -1,11 +1,11 @@
 # movies/management/commands/fix_all_cdn_urls.py
 
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
 CDN_BASE = "https://cdn.papertigercinema.com"
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Fix malformed relative and duplicated CDN URLs in movie records."
 
     def handle(self, *args, **kwargs):
@@ -1,14 +1,14 @@
 # movies/management/commands/fix_cdn_movie_urls.py
 
 import os
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
 CDN_DOMAIN = "https://cdn.papertigercinema.com"
 BASE_MEDIA_PATH = "media/movies"
 ARCHIVE_DOMAINS = ("https://archive.org", "http://archive.org")
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Update movie URLs to CDN if local files exist and skip archive.org"
 
     def handle(self, *args, **kwargs):
@@ -1,7 +1,7 @@
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Fix malformed URLs where CDN was prepended to archive.org links"
 
     def handle(self, *args, **kwargs):
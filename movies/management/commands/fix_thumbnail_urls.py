@@ -1,9 +1,9 @@
 # movies/management/commands/fix_thumbnails_urls.py
 
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Fix malformed CDN URLs in the database (e.g., duplicated paths or missing slashes)."
 
     def handle(self, *args, **kwargs):
@@ -7,7 +7,7 @@ import requests
 from PIL import Image
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models             import Movie
 
 log = logging.getLogger(__name__)
@@ -69,7 +69,7 @@ def load_image(url_or_path: str) -> Image.Image | None:
         return None
 
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Replace useless thumbnails (black, repeated, missing) with a colourful placeholder."
 
     def add_arguments(self, parser):
@@ -108,7 +108,7 @@ class Command(BaseCommand):
                 self.stdout.write(f"→ {movie.title[:45]:45}  –  {reason}")
                 if not dry_run:
                     movie.thumbnail_url = PLACEHOLDER_URL
-                    movie.save(update_fields=["thumbnail_url"])
+                    movie.save(update_fields=["thumbnail_url", "updated_at"])
                 touched += 1
 
         self.stdout.write(
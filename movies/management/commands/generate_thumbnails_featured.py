@@ -2,11 +2,11 @@
 
 import os
 import subprocess
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 from django.conf import settings
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Generate thumbnails using FFmpeg for featured movies that are missing them."
 
     def add_arguments(self, parser):
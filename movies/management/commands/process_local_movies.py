@@ -24,7 +24,7 @@ import tempfile
 from pathlib import Path
 
 import requests
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from django.db.models import Q
 
 from movies.models import Movie
@@ -48,7 +48,7 @@ TIMEOUT = 30            # seconds
 
 # ---------- command -----------------------------------------------------------
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Download, convert, thumbnail and update Movie rows."
 
     def add_arguments(self, parser):
@@ -132,7 +132,7 @@ class Command(BaseCommand):
                 self.stderr.write("    thumbnail generation failed")
 
             # ---- 5. save row --------------------------------------------------
-            movie.save(update_fields=["video_url", "thumbnail_url"])
+            movie.save(update_fields=["video_url", "thumbnail_url", "updated_at"])
             self.stdout.write("    done")
 
             # ---- 6. cleanup ---------------------------------------------------
@@ -1,13 +1,13 @@
 import os
 import subprocess
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 from django.conf import settings
 
 MEDIA_ROOT = os.path.join(settings.BASE_DIR, 'media', 'movies')
 THUMBNAIL_DIR = os.path.join(settings.BASE_DIR, 'media', 'thumbnails')
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = 'Convert .avi to .mp4 and extract thumbnails using ffmpeg'
 
     def handle(self, *args, **kwargs):
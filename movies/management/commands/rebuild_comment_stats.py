@@ -0,0 +1,18 @@
+# movies/management/commands/rebuild_comment_stats.py
+
+from movies.management.base import CatalogCommand
+from movies.models import Movie
+from movies.stats import rebuild_comment_stats
+
+class Command(CatalogCommand):
+    help = "Recompute Movie.comment_count / rating_* aggregates from the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("slugs", nargs="*", help="Only these movies (default: all).")
+
+    def handle(self, *args, **options):
+        movies = Movie.objects.all()
+        if options["slugs"]:
+            movies = movies.filter(slug__in=options["slugs"])
+        written = rebuild_comment_stats(movies)
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt comment stats for {written} movies."))
@@ -1,9 +1,9 @@
 # movies/management/commands/remove_non_public_domain.py
 
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Delete movies that are likely not in the public domain based on year and basic rules."
 
     def add_arguments(self, parser):
@@ -0,0 +1,172 @@
+# movies/management/commands/seed_bench_catalog.py
+
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from movies.genres import link_genres
+from movies.management.base import CatalogCommand
+from movies.models import Comment, Favorite, Movie, PlaybackProgress, WatchLater
+from movies.slugs import bulk_create_with_slugs
+from movies.stats import rebuild_comment_stats
+
+# Synthetic rows are tagged so --flush can find them again.
+MOVIE_PREFIX = "bench-"       # Movie.archive_identifier
+USER_PREFIX = "bench-user-"   # User.username
+
+GENRES = ["Horror", "Comedy", "Drama", "Sci-Fi", "Action", "Romance", "Western", "Thriller"]
+GENRE_WEIGHTS = [18, 16, 22, 8, 10, 9, 7, 10]
+ADJECTIVES = ["Dark", "Silent", "Lost", "Last", "Crimson", "Hidden", "Golden", "Broken", "Haunted", "Wild",
+              "Forgotten", "Midnight", "Burning", "Frozen", "Secret", "Savage", "Little", "Great", "Strange", "Lonely"]
+NOUNS = ["House", "River", "Stranger", "Empire", "Island", "Night", "City", "Road", "Mountain", "Shadow",
+         "Train", "Garden", "Frontier", "Voyage", "Castle", "Witness", "Bride", "Planet", "Valley", "Circus"]
+PLACES = ["Tombstone", "Paris", "Mars", "Chinatown", "the Bayou", "Monterey", "Berlin", "the Moon"]
+# Punctuation / case variants of one title: distinct titles, identical slugify() result.
+COLLISIONS = ["", "!", "?", "...", ":", " (Restored)", "!!"]
+WORDS = ("the a of and in on murder love gold ghost city night war river train stranger town secret "
+         "sheriff detective dancer monster ship island family escape revenge mystery fortune").split()
+
+
+class Command(CatalogCommand):
+    help = ("Generate a deterministic synthetic catalog for benchmarks (bench_catalog): "
+            "movies with colliding slugs, users with favorites, watch-later, progress and comments.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--movies", type=int, default=100_000)
+        parser.add_argument("--users", type=int, default=50_000)
+        parser.add_argument("--favorites", type=int, default=8, help="Average favorites per user.")
+        parser.add_argument("--watchlater", type=int, default=4, help="Average watch-later entries per user.")
+        parser.add_argument("--progress", type=int, default=6, help="Average progress rows per user.")
+        parser.add_argument("--comments", type=int, default=2, help="Average comments per user.")
+        parser.add_argument("--seed", type=int, default=20240601)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--flush", action="store_true", help="Delete earlier synthetic rows first.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        if options["flush"]:
+            users, _ = User.objects.filter(username__startswith=USER_PREFIX).delete()
+            movies, _ = Movie.objects.filter(archive_identifier__startswith=MOVIE_PREFIX).delete()
+            self.stdout.write(f"  flushed {movies + users} synthetic rows")
+        elif Movie.objects.filter(archive_identifier__startswith=MOVIE_PREFIX).exists():
+            self.stderr.write(self.style.ERROR("Synthetic catalog already present; rerun with --flush."))
+            return
+
+        movie_ids = self.create_movies(options["movies"])
+        user_ids = self.create_users(options["users"])
+        self.create_libraries(user_ids, movie_ids, options)
+        written = rebuild_comment_stats(Movie.objects.filter(archive_identifier__startswith=MOVIE_PREFIX))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Seeded {len(movie_ids)} movies, {len(user_ids)} users (comment stats on {written} movies)."))
+
+    # -- movies --------------------------------------------------------------
+
+    def titles(self, count):
+        """Unique titles, with runs of punctuation variants that slugify identically."""
+        seen = set(Movie.objects.values_list("title", flat=True))  # Movie.title is unique
+        sequels, produced = {}, 0
+        while produced < count:
+            base = self.rng.choice([
+                lambda: f"The {self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)}",
+                lambda: f"{self.rng.choice(NOUNS)} of {self.rng.choice(PLACES)}",
+                lambda: f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {self.rng.randint(2, 9)}",
+                lambda: f"The {self.rng.choice(NOUNS)} from {self.rng.choice(PLACES)} ({self.rng.randint(1915, 1975)})",
+            ])()
+            sequels[base] = sequels.get(base, 0) + 1
+            if sequels[base] > 1:
+                base = f"{base} Part {sequels[base]}"
+            for variant in COLLISIONS[: self.rng.randint(1, len(COLLISIONS))]:
+                title = base + variant
+                if self.rng.random() < 0.1:
+                    title = title.upper()
+                if title not in seen and produced < count:
+                    seen.add(title)
+                    produced += 1
+                    yield title
+
+    def create_movies(self, count):
+        ids, genres = [], []
+        batch = []
+        for i, title in enumerate(self.titles(count)):
+            rng = self.rng
+            batch.append(Movie(
+                title=title,
+                archive_identifier=f"{MOVIE_PREFIX}{i:07d}",
+                overview=" ".join(rng.choices(WORDS, k=rng.randint(20, 80))).capitalize() + ".",
+                year=rng.randint(1910, 1979),
+                genre=rng.choices(GENRES, GENRE_WEIGHTS)[0],
+                video_url=f"https://cdn.example.invalid/bench/{i}.mp4",
+                thumbnail_url=f"https://cdn.example.invalid/bench/{i}.jpg",
+                runtime_minutes=rng.randint(45, 160) if rng.random() > 0.05 else None,
+                is_featured=rng.random() < 0.01,
+                is_hero=i < 12,
+                views=min(int(rng.paretovariate(1.2) * 10), 10_000_000),
+            ))
+            if len(batch) >= self.batch_size:
+                created = bulk_create_with_slugs(Movie, batch, batch_size=1000)
+                ids += [m.id for m in created]
+                genres += [(m.id, m.genre) for m in created]
+                batch = []
+                self.stdout.write(f"  movies: {len(ids)}/{count}")
+        if batch:
+            created = bulk_create_with_slugs(Movie, batch, batch_size=1000)
+            ids += [m.id for m in created]
+            genres += [(m.id, m.genre) for m in created]
+        self.link_genres(genres)
+        return ids
+
+    def link_genres(self, movies):
+        """Each movie's primary genre, plus a second one for about a third of them."""
+        extra = [(movie_id, self.rng.choices(GENRES, GENRE_WEIGHTS)[0])
+                 for movie_id, _ in movies if self.rng.random() < 0.3]
+        link_genres(movies, primary=True)  # bulk_create skipped the Movie.genre signal
+        link_genres(extra)
+        self.stdout.write(f"  genre links: {len(movies) + len(extra)}")
+
+    # -- users and their libraries ----------------------------------------------
+
+    def create_users(self, count):
+        password = make_password(None)  # unusable; benchmarks authenticate with minted tokens
+        ids = []
+        for start in range(0, count, self.batch_size):
+            users = [User(username=f"{USER_PREFIX}{n:06d}", email=f"{USER_PREFIX}{n:06d}@example.invalid",
+                          password=password, is_active=True)
+                     for n in range(start, min(start + self.batch_size, count))]
+            ids += [u.id for u in User.objects.bulk_create(users, batch_size=1000)]
+            self.stdout.write(f"  users: {len(ids)}/{count}")
+        return ids
+
+    def pick_movies(self, movie_ids, average):
+        """Distinct movies for one user, skewed towards a popular head of the catalog."""
+        k = min(len(movie_ids), int(self.rng.expovariate(1 / average))) if average else 0
+        picked = set()
+        while len(picked) < k:
+            picked.add(movie_ids[int(len(movie_ids) * self.rng.random() ** 3)])
+        return sorted(picked)
+
+    def create_libraries(self, user_ids, movie_ids, options):
+        rows = {Favorite: [], WatchLater: [], PlaybackProgress: [], Comment: []}
+        for n, user_id in enumerate(user_ids, 1):
+            rows[Favorite] += [Favorite(user_id=user_id, movie_id=m)
+                               for m in self.pick_movies(movie_ids, options["favorites"])]
+            rows[WatchLater] += [WatchLater(user_id=user_id, movie_id=m)
+                                 for m in self.pick_movies(movie_ids, options["watchlater"])]
+            rows[PlaybackProgress] += [PlaybackProgress(user_id=user_id, movie_id=m, position=self.rng.randint(0, 7200))
+                                       for m in self.pick_movies(movie_ids, options["progress"])]
+            for _ in range(int(self.rng.expovariate(1 / options["comments"])) if options["comments"] else 0):
+                rows[Comment].append(Comment(
+                    user_id=user_id,
+                    movie_id=movie_ids[int(len(movie_ids) * self.rng.random() ** 3)],
+                    text=" ".join(self.rng.choices(WORDS, k=self.rng.randint(3, 40))).capitalize(),
+                    rating=self.rng.choice([None, 1, 2, 3, 4, 5, 4, 5]),
+                ))
+            if n % self.batch_size == 0 or n == len(user_ids):
+                with transaction.atomic():
+                    for model, objs in rows.items():
+                        model.objects.bulk_create(objs, batch_size=1000)
+                        objs.clear()
+                self.stdout.write(f"  libraries: {n}/{len(user_ids)} users")
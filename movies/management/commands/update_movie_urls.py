@@ -1,14 +1,14 @@
 # movies/management/commands/update_movie_urls.py
 
 import os
-from django.core.management.base import BaseCommand
+from movies.management.base import CatalogCommand
 from movies.models import Movie
 
 CDN_DOMAIN = "https://cdn.papertigercinema.com"
 LOCAL_VIDEO_DIR = "media/movies"
 LOCAL_THUMB_DIR = "media/movies/thumbnails"
 
-class Command(BaseCommand):
+class Command(CatalogCommand):
     help = "Update movie URLs to CDN if the local file exists"
 
     def handle(self, *args, **kwargs):
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0021_movie_comment_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['year'], name='movie_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['runtime_minutes'], name='movie_runtime_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0022_movie_range_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['title', 'id'], name='movie_title_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['genre', 'title', 'id'], name='movie_genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('is_hero', True)), fields=['-year'], name='movie_hero_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['title', 'id'], name='movie_featured_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['genre', 'title', 'id'], name='movie_featured_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlater',
+            index=models.Index(fields=['user', '-added_at'], name='watchlater_user_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playbackprogress',
+            index=models.Index(fields=['user', '-updated_at'], name='progress_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['movie', '-created_at', '-id'], name='comment_movie_created_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0023_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, unique=True)),
+                ('slug', models.SlugField(max_length=150, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='movie',
+            name='movie_genre_title_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='movie',
+            name='movie_featured_genre_idx',
+        ),
+        migrations.AddField(
+            model_name='moviegenre',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.genre'),
+        ),
+        migrations.AddField(
+            model_name='moviegenre',
+            name='movie',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.movie'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='genres',
+            field=models.ManyToManyField(blank=True, related_name='movies', through='movies.MovieGenre', to='movies.genre'),
+        ),
+        migrations.AddIndex(
+            model_name='moviegenre',
+            index=models.Index(fields=['genre', 'movie'], name='moviegenre_genre_movie_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='moviegenre',
+            unique_together={('movie', 'genre')},
+        ),
+    ]
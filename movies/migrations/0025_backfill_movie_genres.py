@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:27
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def backfill_movie_genres(apps, schema_editor):
+    """One Genre per distinct Movie.genre (by slug, as movies/genres.py does) and one link per movie."""
+    Movie = apps.get_model('movies', 'Movie')
+    Genre = apps.get_model('movies', 'Genre')
+    MovieGenre = apps.get_model('movies', 'MovieGenre')
+
+    genre_ids = {}
+    for name in sorted(set(Movie.objects.exclude(genre='').values_list('genre', flat=True))):
+        if not name.strip():
+            continue
+        slug = slugify(name) or 'uncategorized'
+        genre, _ = Genre.objects.get_or_create(slug=slug, defaults={'name': name.strip()})
+        genre_ids[name] = genre.id
+
+    batch = []
+    for movie_id, name in Movie.objects.exclude(genre='').values_list('id', 'genre').iterator(chunk_size=5000):
+        if name in genre_ids:
+            batch.append(MovieGenre(movie_id=movie_id, genre_id=genre_ids[name]))
+        if len(batch) >= 5000:
+            MovieGenre.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    MovieGenre.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0024_genre'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_movie_genres, migrations.RunPython.noop),
+    ]
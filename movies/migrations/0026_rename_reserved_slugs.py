@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from movies.slugs import SlugAllocator
+
+# movies.slugs.RESERVED_SLUGS when this migration was written.
+RESERVED_SLUGS = frozenset({
+    'snapshot', 'facets', 'genre-rows', 'hero-movies', 'library',
+    'favorites', 'watchlater', 'progress', 'comments',
+})
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    """Move movies off slugs that a fixed route under /api/movies/ shadows, e.g. library -> library-1."""
+    Movie = apps.get_model('movies', 'Movie')
+    allocator = SlugAllocator(Movie.objects.all(), reserved=RESERVED_SLUGS)
+    for movie in Movie.objects.filter(slug__in=RESERVED_SLUGS).only('id', 'slug'):
+        movie.slug = allocator.allocate(movie.slug)
+        movie.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0025_backfill_movie_genres'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_reserved_slugs, migrations.RunPython.noop),
+    ]
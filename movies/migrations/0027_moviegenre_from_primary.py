@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 23:05
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+def mark_primary_links(apps, schema_editor):
+    """Flag the link matching each movie's Movie.genre (0025 made those), as movies/genres.py would."""
+    Movie = apps.get_model('movies', 'Movie')
+    MovieGenre = apps.get_model('movies', 'MovieGenre')
+    for name in sorted(set(Movie.objects.exclude(genre='').values_list('genre', flat=True))):
+        if not name.strip():
+            continue
+        slug = slugify(name) or 'uncategorized'
+        (MovieGenre.objects
+         .filter(Q(genre__slug=slug) | Q(genre__name__iexact=name.strip()), movie__genre=name)
+         .update(from_primary=True))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0026_rename_reserved_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviegenre',
+            name='from_primary',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_primary_links, migrations.RunPython.noop),
+    ]
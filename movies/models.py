@@ -1,7 +1,10 @@
-from django.db import models
-from django.contrib.auth.models import User
-from django.utils.text import slugify  # NEW
+from django.db import IntegrityError, models, transaction
 from django.db.models import Q
+from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+
+from . import slugs
 
 
 class Movie(models.Model):
@@ -18,24 +21,106 @@ class Movie(models.Model):
     views = models.IntegerField(default=0)
     is_public_domain = models.BooleanField(default=True)
     is_hero = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # drives ETag / Last-Modified
+    # Every genre the film was found under; ``genre`` above stays the primary one.
+    genres = models.ManyToManyField("Genre", through="MovieGenre", related_name="movies", blank=True)
+    # Comment / rating aggregates, maintained by movies/stats.py
+    comment_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)  # histogram: number of 1★ ratings, …
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    # Weighted full-text document kept in sync by Postgres itself (see movies/search.py).
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("genre", weight="B", config="english")
+            + SearchVector("overview", weight="C", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="movie_search_vector_gin"),
+            GinIndex(fields=["title"], name="movie_title_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["year"], name="movie_year_idx"),  # ?year__range=
+            models.Index(fields=["runtime_minutes"], name="movie_runtime_idx"),  # ?runtime_minutes__range=
+            # Hot list paths, matching their ORDER BY (keyset pages add "id");
+            # checked by `manage.py audit_query_plans`.
+            models.Index(fields=["title", "id"], name="movie_title_id_idx"),
+            models.Index(fields=["-year"], name="movie_hero_year_idx", condition=Q(is_hero=True)),
+            models.Index(fields=["title", "id"], name="movie_featured_title_idx", condition=Q(is_featured=True)),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # movies/signals.py compares against it, so a save that leaves the
+        # primary genre alone doesn't touch the genre links.
+        instance._loaded_genre = instance.__dict__.get("genre")
+        return instance
 
     def save(self, *args, **kwargs):
-        if not self.slug and self.title:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
+        if self.slug or not self.title:
+            return super().save(*args, **kwargs)
+
+        # One prefix query picks the slug; if a concurrent save grabbed it
+        # first, the unique index rejects ours and we pick again.
+        for attempt in range(1, slugs.MAX_ATTEMPTS + 1):
+            self.slug = slugs.allocate_slug(Movie, self.title)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError as e:
+                if attempt == slugs.MAX_ATTEMPTS or not slugs.is_slug_conflict(e):
+                    self.slug = None
+                    raise
+
+    @property
+    def rating_average(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def rating_histogram(self):
+        return {n: getattr(self, f"rating_{n}") for n in range(1, 6)}
+
+    def __str__(self):
+        return self.title
 
-            # Avoid duplicate slugs
-            while Movie.objects.filter(~Q(id=self.id), slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
 
-            self.slug = slug
+class Genre(models.Model):
+    name = models.CharField(max_length=150, unique=True)
+    slug = models.SlugField(max_length=150, unique=True)  # what ?genre= matches, see movies/genres.py
 
-        super().save(*args, **kwargs)
+    class Meta:
+        ordering = ["name"]
 
     def __str__(self):
-        return self.title
+        return self.name
+
+
+class MovieGenre(models.Model):
+    # The two composite indexes below cover both directions, so the FKs get
+    # no single-column index of their own.
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, db_index=False)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, db_index=False)
+    # Made only for Movie.genre (movies/signals.py), so dropped when it changes;
+    # links from the importer are never removed that way.
+    from_primary = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("movie", "genre")  # movie -> genres
+        indexes = [models.Index(fields=["genre", "movie"], name="moviegenre_genre_movie_idx")]  # genre -> movies
+
+    def __str__(self):
+        return f"{self.movie_id} in {self.genre_id}"
 
 
 class Favorite(models.Model):
@@ -57,6 +142,7 @@ class WatchLater(models.Model):
     class Meta:
         unique_together = ("user", "movie")          # one entry per user/movie
         ordering = ["-added_at"]                     # newest first
+        indexes = [models.Index(fields=["user", "-added_at"], name="watchlater_user_added_idx")]
 
     def __str__(self):
         return f"{self.user.username} → {self.movie.title}"
@@ -72,6 +158,7 @@ class PlaybackProgress(models.Model):
     class Meta:
         unique_together = ("user", "movie")
         ordering        = ["-updated_at"]
+        indexes         = [models.Index(fields=["user", "-updated_at"], name="progress_user_updated_idx")]
 
     def __str__(self):
         mm = self.position // 60
@@ -90,6 +177,8 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Per-movie list, newest first; keyset pages add "-id".
+        indexes = [models.Index(fields=["movie", "-created_at", "-id"], name="comment_movie_created_idx")]
 
     def __str__(self):
         return f"{self.user.username} → {self.movie.title} ({self.rating or '-'}★)"
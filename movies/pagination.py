@@ -0,0 +1,199 @@
+# movies/pagination.py
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination.
+
+    Requests that send neither ``cursor`` nor ``page_size`` get the plain,
+    unpaginated list, exactly as before. Otherwise rows are ordered by the
+    requested ordering field plus ``id`` as a tiebreaker, and each page is
+    fetched with a WHERE on the last key seen, so deep pages cost the same as
+    page one and no COUNT(*) is issued.
+
+    Cursors are opaque base64 tokens; clients should only follow the
+    ``next`` / ``previous`` links from the response.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_param = "ordering"
+    page_size = 50
+    max_page_size = 200
+
+    # Fields a client may order by (mirrors the view's ordering_fields).
+    ordering_fields = ("title", "year")
+    default_ordering = "title"
+    # Annotation used instead of default_ordering when present (search rank).
+    relevance_field = "rank"
+
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None  # legacy behaviour: no pagination
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset)
+        field, descending = self._split(self.ordering)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+
+        # Walking backwards means flipping the sort; NULL keys sort last in
+        # the forward direction and therefore first when walking back.
+        walk_descending = descending != reverse
+        nulls_last = not reverse
+        key = F(field).desc if walk_descending else F(field).asc
+        if self._nullable(queryset, field):
+            primary = key(nulls_last=True) if nulls_last else key(nulls_first=True)
+        else:
+            # NOT NULL key: a bare ORDER BY, which a (field, id) index can
+            # serve in either direction.
+            primary = key()
+            nulls_last = False
+        tiebreak = F("id").desc() if walk_descending else F("id").asc()
+
+        queryset = queryset.order_by(primary, tiebreak)
+        if cursor:
+            queryset = queryset.filter(
+                self._after(field, cursor["v"], cursor["id"], walk_descending, nulls_last)
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        self.field = field
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, queryset):
+        requested = request.query_params.get(self.ordering_param, "")
+        first = requested.split(",")[0].strip()
+        if first.lstrip("-") in self.ordering_fields:
+            return first
+        if self.relevance_field in queryset.query.annotations:
+            return f"-{self.relevance_field}"
+        return self.default_ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    # -- cursor helpers -------------------------------------------------
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            cursor = {"o": cursor["o"], "v": cursor["v"], "id": int(cursor["id"]), "r": bool(cursor["r"])}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if cursor["o"] != self.ordering:
+            # Cursor was minted for a different ordering; positions don't line up.
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, value, pk, reverse):
+        payload = json.dumps(
+            {"o": self.ordering, "v": value, "id": pk, "r": int(reverse)},
+            default=_json_default, separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _link(self, obj, reverse):
+        value = getattr(obj, self.field)
+        token = self.encode_cursor(value, obj.pk, reverse)
+        url = replace_query_param(self.base_url, self.cursor_query_param, token)
+        if self.page_size_query_param not in self.request.query_params:
+            url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return url
+
+    @staticmethod
+    def _split(ordering):
+        return ordering.lstrip("-"), ordering.startswith("-")
+
+    @staticmethod
+    def _nullable(queryset, field):
+        try:
+            return queryset.model._meta.get_field(field).null
+        except FieldDoesNotExist:
+            return True  # annotation, e.g. the search rank
+
+    @staticmethod
+    def _after(field, value, pk, descending, nulls_last):
+        """
+        Rows strictly after (value, pk) in the walk order. NULL keys sit at
+        the end of the walk when ``nulls_last`` and at the start otherwise.
+        """
+        past = "lt" if descending else "gt"
+        if value is None:
+            if nulls_last:
+                return Q(**{f"{field}__isnull": True, f"id__{past}": pk})
+            return (Q(**{f"{field}__isnull": True, f"id__{past}": pk})
+                    | Q(**{f"{field}__isnull": False}))
+        condition = Q(**{f"{field}__{past}": value}) | Q(**{field: value, f"id__{past}": pk})
+        if nulls_last:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+
+class CommentKeysetPagination(KeysetPagination):
+    """Newest comments first, keyed on (created_at, id)."""
+    ordering_fields = ()
+    default_ordering = "-created_at"
+    page_size = 20
+    max_page_size = 100
+
+
+def _json_default(value):
+    # Full microsecond precision: a truncated timestamp would skip rows.
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
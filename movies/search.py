@@ -0,0 +1,54 @@
+# movies/search.py
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q
+from rest_framework import filters
+
+# Share of the title's trigram similarity added to the text rank, so rows that
+# only match through a typo still sort below genuine full-text hits.
+TRIGRAM_WEIGHT = 0.5
+
+
+class MovieSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter (same ``?search=`` parameter).
+
+    Matches against the weighted ``Movie.search_vector`` column (title >
+    genre > overview) through its GIN index, with a trigram match on the
+    title as a fallback for typos, and annotates each row with a ``rank``.
+    PostgreSQL only, like the schema (migration 0019).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        words = [w for term in terms for w in re.findall(r"\w+", term)]
+        if not words:
+            return queryset.none()
+
+        # Prefix-match every word so search-as-you-type works ("termin" → "Terminator").
+        query = SearchQuery(" & ".join(f"{w}:*" for w in words), config="english", search_type="raw")
+        text = " ".join(words)
+
+        return (
+            queryset
+            .filter(Q(search_vector=query) | Q(title__trigram_word_similar=text))
+            .annotate(rank=SearchRank(F("search_vector"), query)
+                      + TrigramWordSimilarity(text, "title") * TRIGRAM_WEIGHT)
+            .order_by("-rank", "id")
+        )
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that keeps the search ranking instead of applying the
+    view's default ordering when the client searched without ``?ordering=``.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if self.ordering_param not in request.query_params and "rank" in queryset.query.annotations:
+            return None
+        return super().get_ordering(request, queryset, view)
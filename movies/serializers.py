@@ -1,12 +1,71 @@
 from rest_framework import serializers
+from backend_api.timing import TimedSerializerMixin
 from .models import Movie, Favorite, WatchLater, PlaybackProgress, Comment
 
-class MovieSerializer(serializers.ModelSerializer):
+
+def requested_fields(request):
+    """Parse ``?fields=a,b,c`` into a list, or None when not given."""
+    raw = request.query_params.get('fields') if request is not None else None
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+# Computed Movie fields and the columns they read.
+DERIVED_COLUMNS = {
+    'rating_average': ['rating_sum', 'rating_count'],
+    'rating_histogram': [f'rating_{n}' for n in range(1, 6)],
+}
+
+
+def model_columns(serializer, extra=()):
+    """Concrete Movie columns a serializer reads, for use with ``.only()``."""
+    concrete = {f.name for f in Movie._meta.concrete_fields}
+    columns = {'id'} | (set(extra) & concrete)
+    for field in serializer.fields.values():
+        if field.source in concrete:
+            columns.add(field.source)
+        columns.update(DERIVED_COLUMNS.get(field.source, ()))
+    return sorted(columns)
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets: pass ``fields=[...]`` to keep only those fields.
+    Unknown names are ignored so clients can't break on a typo; if none of
+    the names is known, the full field set is kept.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        keep = set(fields or ()) & set(self.fields)
+        if keep:
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+
+class MovieSerializer(TimedSerializerMixin, DynamicFieldsMixin, serializers.ModelSerializer):
+    rating_average = serializers.FloatField(read_only=True)
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
     class Meta:
         model = Movie
-        fields = '__all__'
+        # internal full-text column; the per-star counters are exposed as rating_histogram;
+        # genre links are served by /genre-rows/ and ?genre=, not per movie (no extra query each)
+        exclude = ['search_vector', 'genres', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+        read_only_fields = ['comment_count', 'rating_sum', 'rating_count']
 
-class FavoriteSerializer(serializers.ModelSerializer):
+class MovieListSerializer(TimedSerializerMixin, DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact card representation used by list responses."""
+    rating_average = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Movie
+        fields = ['id', 'slug', 'title', 'year', 'genre', 'thumbnail_url', 'runtime_minutes',
+                  'comment_count', 'rating_average']
+
+class FavoriteSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     movie = MovieSerializer(read_only=True)
     movie_id = serializers.PrimaryKeyRelatedField(
         queryset=Movie.objects.all(), source='movie', write_only=True
@@ -17,18 +76,24 @@ class FavoriteSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'movie', 'movie_id']
         read_only_fields = ['user']
 
-class WatchLaterSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        movie_fields = kwargs.pop('movie_fields', None)
+        super().__init__(*args, **kwargs)
+        if movie_fields:
+            self.fields['movie'] = MovieSerializer(read_only=True, fields=movie_fields)
+
+class WatchLaterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model  = WatchLater
         fields = ["id", "movie", "added_at"]        # “movie” returns its id by default
 
-class PlaybackProgressSerializer(serializers.ModelSerializer):
+class PlaybackProgressSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model  = PlaybackProgress
         fields = ["id", "movie", "position", "updated_at"]
         read_only_fields = ["id", "updated_at"]
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source="user.username", read_only=True)
 
     class Meta:
@@ -0,0 +1,41 @@
+# movies/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from .genres import set_primary_genre
+from .models import Movie, Genre, MovieGenre, Comment
+from .snapshot import genre_key
+from .stats import comment_added, comment_removed
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=MovieGenre)   # e.g. the admin inline; genres.link_genres bumps its bulk inserts
+@receiver(post_delete, sender=MovieGenre)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Movie)
+def link_primary_genre(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "genre" not in update_fields):
+        return
+    loaded = getattr(instance, "_loaded_genre", None)  # None: not loaded from the db, or deferred
+    if not created and loaded is not None and genre_key(loaded) == genre_key(instance.genre):
+        return
+    set_primary_genre(instance.pk, instance.genre)
+    instance._loaded_genre = instance.genre
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        comment_added(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_deleted_comment(sender, instance, **kwargs):
+    comment_removed(instance)
@@ -1,26 +1,61 @@
+"""
+Sitemaps for the public site.
+
+Movie URLs are rendered ahead of time into gzipped shards of
+``MovieSitemap.limit`` URLs each (``write_sitemaps``, run by the
+``build_sitemaps`` command, by a CatalogCommand that changed the catalog and
+in a background thread when a request finds the catalog changed), so a crawler request only
+streams a file from storage. Builds are published the same way as the
+catalog snapshot (see movies.snapshot). Layout inside the default storage::
+
+    sitemaps/current.json                 manifest for the latest build
+    sitemaps/<build>/movies-<n>.xml.gz    one shard per 10k movies
+    sitemaps/<build>/static.xml.gz        home and the other fixed pages
+    sitemaps/<build>/genres.xml.gz        genre landing pages
+"""
+from xml.sax.saxutils import escape
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.core.files import File
+from django.utils import timezone
+
 from .models import Movie
-from django.urls import reverse
+from .snapshot import (GzipWriter, build_directory, current_build, manifest_builds, prune,
+                       publish_manifest, read_manifest, save_file, snapshot_stamp)
+
+SITEMAP_ROOT = "sitemaps"
+SITEMAP_MANIFEST = f"{SITEMAP_ROOT}/current.json"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
 
 class MovieSitemap(Sitemap):
     changefreq = "monthly"
     priority = 0.9
+    limit = 10000
 
     def items(self):
-        return Movie.objects.all()
+        # (slug, updated_at) tuples: no model instances, no overview text.
+        return (Movie.objects.exclude(slug__isnull=True).exclude(slug="")
+                .order_by("id").values_list("slug", "updated_at"))
 
-    def location(self, obj):
-        return f"/movies/{obj.slug}"
+    def location(self, item):
+        return f"/movies/{item[0]}"
+
+    def lastmod(self, item):
+        return item[1]
 
 class StaticViewSitemap(Sitemap):
     priority = 0.6
     changefreq = "monthly"
+    # Frontend pages, so not reversible from this project's URLconf.
+    paths = {'home': '/', 'about': '/about', 'terms': '/terms', 'privacy': '/privacy', 'copyright': '/copyright'}
 
     def items(self):
         return ['home', 'about', 'terms', 'privacy', 'copyright']
 
     def location(self, item):
-        return reverse(item)
+        return self.paths[item]
 
 class GenreSitemap(Sitemap):
     priority = 0.7
@@ -34,3 +69,86 @@ class GenreSitemap(Sitemap):
 
     def location(self, genre):
         return f"/genre/{genre}"
+
+
+class _UrlsetWriter(GzipWriter):
+    head = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">'.encode()
+    tail = b"</urlset>\n"
+
+    def __init__(self):
+        super().__init__()
+        self.lastmod = None
+
+    def add(self, sitemap, item):
+        lastmod = sitemap.lastmod(item) if hasattr(sitemap, "lastmod") else None
+        entry = f"<url><loc>{escape(settings.SITEMAP_BASE_URL + sitemap.location(item))}</loc>"
+        if lastmod:
+            entry += f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+            self.lastmod = max(self.lastmod, lastmod) if self.lastmod else lastmod
+        entry += (f"<changefreq>{sitemap.changefreq}</changefreq>"
+                  f"<priority>{sitemap.priority}</priority></url>")
+        self.write(entry.encode("utf-8"))
+
+
+def write_sitemaps(version=None):
+    """Render every shard in one streaming pass and publish the manifest."""
+    version = version or snapshot_stamp()
+    base = build_directory(SITEMAP_ROOT, version)
+    previous = read_sitemap_manifest()
+    sections = {}
+
+    def publish(section, writer):
+        name = save_file(f"{base}/{section}.xml.gz", File(writer.close()))
+        sections[section] = {
+            "file": name,
+            "count": writer.count,
+            "lastmod": writer.lastmod.isoformat() if writer.lastmod else None,
+        }
+
+    movies, writer, shard = MovieSitemap(), None, 0
+    for item in movies.items().iterator(chunk_size=2000):
+        if writer is None or writer.count == movies.limit:
+            if writer:
+                publish(f"movies-{shard}", writer)
+            writer, shard = _UrlsetWriter(), shard + 1
+        writer.add(movies, item)
+    if writer:
+        publish(f"movies-{shard}", writer)
+
+    for section, sitemap in (("static", StaticViewSitemap()), ("genres", GenreSitemap())):
+        writer = _UrlsetWriter()
+        for item in sitemap.items():
+            writer.add(sitemap, item)
+        publish(section, writer)
+
+    manifest = {
+        "version": version,
+        "build": base.rsplit("/", 1)[1],
+        "previous": previous["version"] if previous else None,
+        "previous_build": (previous.get("build") or previous["version"]) if previous else None,
+        "generated_at": timezone.now().isoformat(),
+        "sections": sections,
+    }
+    publish_manifest(SITEMAP_MANIFEST, manifest)
+    prune(SITEMAP_ROOT, keep=manifest_builds(manifest))
+    return manifest
+
+
+def read_sitemap_manifest():
+    return read_manifest(SITEMAP_MANIFEST)
+
+
+def current_sitemaps():
+    return current_build("sitemaps", read_sitemap_manifest, write_sitemaps)
+
+
+def render_sitemap_index(manifest, location):
+    """``location(section)`` gives the absolute URL a shard is served from."""
+    parts = [f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">']
+    for section, shard in manifest["sections"].items():
+        parts.append(f"<sitemap><loc>{escape(location(section))}</loc>")
+        if shard["lastmod"]:
+            parts.append(f"<lastmod>{shard['lastmod']}</lastmod>")
+        parts.append("</sitemap>")
+    parts.append("</sitemapindex>\n")
+    return "".join(parts)
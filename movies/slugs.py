@@ -0,0 +1,148 @@
+# movies/slugs.py
+"""
+Slug allocation for Movie (or any model with a unique slug column).
+
+Instead of probing ``slug``, ``slug-1``, ``slug-2`` … one query at a time,
+the allocator loads the existing slugs that are candidates for a base
+(the base itself, or its stem followed by ``-<n>``) in a single query and
+picks the lowest free suffix in memory. A batch of titles costs one query
+per chunk of distinct bases, which makes it usable before ``bulk_create``.
+
+Two writers can still pick the same slug between the read and the INSERT;
+the unique index catches that and callers retry (see ``Movie.save`` and
+``bulk_create_with_slugs``).
+
+``RESERVED_SLUGS`` are never handed out: movie details live at
+``/api/movies/<slug>/`` after the fixed routes, which would shadow them.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+FALLBACK_SLUG = "untitled"
+SUFFIX_ROOM = 7       # "-999999": room kept for a numeric suffix on long slugs
+PREFETCH_CHUNK = 100  # bases OR'ed into one prefix query
+MAX_ATTEMPTS = 5
+
+# First path segments of the fixed routes in movies/urls.py; keep in sync.
+RESERVED_SLUGS = frozenset({
+    "snapshot", "facets", "genre-rows", "hero-movies", "library",
+    "favorites", "watchlater", "progress", "comments",
+})
+
+
+class SlugAllocator:
+    def __init__(self, queryset, field="slug", reserved=RESERVED_SLUGS):
+        self.queryset = queryset
+        self.field = field
+        self.reserved = reserved
+        self.max_length = queryset.model._meta.get_field(field).max_length
+        self._taken = {}  # base -> slugs already used (in the db or handed out)
+
+    def base(self, text):
+        return slugify(text)[: self.max_length].strip("-") or FALLBACK_SLUG
+
+    def _prefix(self, base):
+        # Every suffixed candidate for ``base`` starts with this, even once
+        # truncated to fit the suffix.
+        return base[: self.max_length - SUFFIX_ROOM].rstrip("-")
+
+    def _pattern(self, base):
+        """
+        Regex matching exactly the suffixed candidates of ``base``: the
+        prefix, as much of the rest of ``base`` as ``candidate`` may keep,
+        then ``-<n>``.
+        """
+        prefix = self._prefix(base)
+        rest = base[len(prefix):]
+        optional = "".join(f"({re.escape(c)}" for c in rest) + ")?" * len(rest)
+        return f"^{re.escape(prefix)}{optional}-[0-9]+$"
+
+    def _condition(self, base):
+        # The startswith keeps the index usable; the regex drops longer titles
+        # that merely share the prefix ("alien" vs "aliens-2").
+        return Q(**{self.field: base}) | Q(**{f"{self.field}__startswith": self._prefix(base),
+                                             f"{self.field}__regex": self._pattern(base)})
+
+    def prefetch(self, bases):
+        """Load the slugs in use for ``bases`` (one query per chunk)."""
+        missing = sorted({b for b in bases if b not in self._taken})
+        for start in range(0, len(missing), PREFETCH_CHUNK):
+            chunk = missing[start:start + PREFETCH_CHUNK]
+            condition = reduce(or_, (self._condition(b) for b in chunk))
+            existing = set(self.queryset.filter(condition).values_list(self.field, flat=True))
+            for b in chunk:
+                pattern = re.compile(self._pattern(b))
+                self._taken[b] = {s for s in existing if s == b or pattern.match(s)}
+
+    def candidate(self, base, n):
+        if n == 0:
+            return base
+        suffix = f"-{n}"
+        return f"{base[: self.max_length - len(suffix)].rstrip('-')}{suffix}"
+
+    def allocate(self, text):
+        base = self.base(text)
+        self.prefetch([base])
+        taken = self._taken[base]
+        n = 0
+        while self.candidate(base, n) in taken or self.candidate(base, n) in self.reserved:
+            n += 1
+        slug = self.candidate(base, n)
+        taken.add(slug)
+        return slug
+
+    def forget(self):
+        """Drop what was loaded; the next allocation re-reads the table."""
+        self._taken.clear()
+
+
+def allocate_slug(model, text):
+    return SlugAllocator(model._default_manager.all()).allocate(text)
+
+
+def assign_slugs(objs, source="title", allocator=None):
+    """
+    Give every object in ``objs`` without a slug a unique one, derived from
+    its ``source`` attribute. Objects sharing a title get distinct suffixes.
+    """
+    objs = [obj for obj in objs if not obj.slug and getattr(obj, source)]
+    if not objs:
+        return allocator
+    allocator = allocator or SlugAllocator(type(objs[0])._default_manager.all())
+    allocator.prefetch(allocator.base(getattr(obj, source)) for obj in objs)
+    for obj in objs:
+        obj.slug = allocator.allocate(getattr(obj, source))
+    return allocator
+
+
+def is_slug_conflict(error, field="slug"):
+    """Whether an IntegrityError came from the unique index on ``field``."""
+    # Postgres: "Key (slug)=(...) already exists"; SQLite: "... movies_movie.slug"
+    return re.search(rf"\({field}\)=|\.{field}\b", str(error)) is not None
+
+
+def bulk_create_with_slugs(model, objs, batch_size=1000, **kwargs):
+    """
+    ``bulk_create`` that fills in slugs first. If a concurrent writer took
+    one of the slugs in the meantime, the batch is rolled back, re-allocated
+    from fresh data and retried.
+    """
+    objs = list(objs)
+    allocator = SlugAllocator(model._default_manager.all())
+    fresh = [obj for obj in objs if not obj.slug]
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        assign_slugs(objs, allocator=allocator)
+        try:
+            with transaction.atomic():
+                return model._default_manager.bulk_create(objs, batch_size=batch_size, **kwargs)
+        except IntegrityError as e:
+            if attempt == MAX_ATTEMPTS or not is_slug_conflict(e):
+                raise
+            allocator.forget()
+            for obj in fresh:
+                obj.slug = None
@@ -0,0 +1,285 @@
+# movies/snapshot.py
+"""
+Precompressed, versioned JSON snapshots of the public catalog.
+
+Layout inside the default storage (MEDIA_ROOT unless configured otherwise)::
+
+    catalog/current.json                      manifest for the latest build
+    catalog/<build>/catalog.json.gz           every movie
+    catalog/<build>/genres/<slug>.json.gz     one shard per genre
+
+Shards follow the ``MovieGenre`` links, as ``?genre=`` does: a film is in
+the shard of every genre it is linked to. A build is identified by a stamp
+derived from ``MAX(updated_at)`` and the row count (link changes touch
+``updated_at``), so every worker agrees on whether it is current. Each build
+writes into a fresh ``<stamp>-<random>`` directory and files are never
+modified, so the web tier or CDN can serve them with long-lived caching.
+The manifest is swapped in one step once a build is complete.
+
+Requests never build: they serve the last published manifest and, when
+the catalog has changed since, start a rebuild in a background thread.
+Management commands build inline (build_catalog_snapshot, and CatalogCommand
+after a successful run that changed the catalog).
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Count, Max, OuterRef
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.text import slugify
+
+from .cache import get_catalog_version
+from .models import Genre, Movie, MovieGenre
+
+SNAPSHOT_ROOT = "catalog"
+MANIFEST_NAME = f"{SNAPSHOT_ROOT}/current.json"
+REBUILD_LOCK_TIMEOUT = 600
+STALE_RECHECK_SECONDS = 10  # how long a request may keep serving a build known to be out of date
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_fields():
+    return [f.name for f in Movie._meta.concrete_fields if f.name != "search_vector"]
+
+
+def genre_key(genre):
+    return slugify(genre) or "uncategorized"
+
+
+class GzipWriter:
+    """Streams ``head item sep item … tail`` into a gzip-compressed temporary file."""
+    head, sep, tail = b"", b"", b""
+
+    def __init__(self):
+        self.tmp = tempfile.TemporaryFile()
+        self.gz = gzip.GzipFile(fileobj=self.tmp, mode="wb", compresslevel=9)
+        self.gz.write(self.head)
+        self.count = 0
+
+    def write(self, encoded_row):
+        if self.count:
+            self.gz.write(self.sep)
+        self.gz.write(encoded_row)
+        self.count += 1
+
+    def close(self):
+        self.gz.write(self.tail)
+        self.gz.close()
+        self.tmp.seek(0)
+        return self.tmp
+
+
+class _JsonArrayWriter(GzipWriter):
+    head, sep, tail = b"[", b",", b"]"
+
+
+def save_file(name, fileobj):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, fileobj)
+
+
+def build_directory(root, version):
+    """A fresh directory per build, so a rebuild never touches files a reader may be streaming."""
+    return f"{root}/{version}-{uuid.uuid4().hex[:8]}"
+
+
+def publish_manifest(name, manifest):
+    """
+    Replace the manifest in one step: a reader sees the old one or the new
+    one, never a missing file. Locally that is a temporary file renamed over
+    the old one; object stores replace a key atomically on upload.
+    """
+    data = json.dumps(manifest, indent=2).encode("utf-8")
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        with default_storage.open(name, "wb") as fh:
+            fh.write(data)
+        return
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".manifest-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, settings.FILE_UPLOAD_PERMISSIONS or 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def manifest_builds(manifest):
+    """Build directories a manifest and its predecessor point at (the ones to keep)."""
+    if manifest is None:
+        return set()
+    return {manifest.get("build") or manifest["version"], manifest.get("previous_build") or manifest["previous"]}
+
+
+def snapshot_stamp():
+    """Identity of the catalog's current contents, from one aggregate query."""
+    stats = Movie.objects.aggregate(last=Max("updated_at"), count=Count("pk"))
+    last = stats["last"].strftime("%Y%m%d%H%M%S%f") if stats["last"] else "0"
+    return f"{last}-{stats['count']}"
+
+
+def write_catalog_snapshot(version=None):
+    """
+    Build the snapshot in one streaming pass over the table, publish its
+    manifest and drop builds older than the previous one.
+    """
+    version = version or snapshot_stamp()
+    base = build_directory(SNAPSHOT_ROOT, version)
+    previous = read_manifest()
+
+    everything = _JsonArrayWriter()
+    shards, genre_names = {}, {}
+    genres_by_id = {pk: (slug, name) for pk, slug, name in Genre.objects.values_list("pk", "slug", "name")}
+    rows = (Movie.objects.order_by("title")
+            .annotate(_genre_ids=ArraySubquery(MovieGenre.objects.filter(movie=OuterRef("pk")).values("genre_id")))
+            .values(*snapshot_fields(), "_genre_ids")
+            .iterator(chunk_size=2000))
+    for row in rows:
+        linked = [genres_by_id[pk] for pk in row.pop("_genre_ids") if pk in genres_by_id]
+        encoded = json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")).encode("utf-8")
+        everything.write(encoded)
+        for key, name in linked or [(genre_key(""), "")]:
+            if key not in shards:
+                shards[key] = _JsonArrayWriter()
+                genre_names[key] = name
+            shards[key].write(encoded)
+
+    catalog_name = save_file(f"{base}/catalog.json.gz", File(everything.close()))
+    genres = {}
+    for key, writer in shards.items():
+        name = save_file(f"{base}/genres/{key}.json.gz", File(writer.close()))
+        genres[key] = {"genre": genre_names[key], "file": name, "count": writer.count}
+
+    manifest = {
+        "version": version,
+        "build": base.rsplit("/", 1)[1],
+        "previous": previous["version"] if previous else None,
+        "previous_build": (previous.get("build") or previous["version"]) if previous else None,
+        "generated_at": timezone.now().isoformat(),
+        "count": everything.count,
+        "catalog": catalog_name,
+        "genres": genres,
+    }
+    publish_manifest(MANIFEST_NAME, manifest)
+    prune(SNAPSHOT_ROOT, keep=manifest_builds(manifest))
+    return manifest
+
+
+def read_manifest(name=MANIFEST_NAME):
+    if not default_storage.exists(name):
+        return None
+    with default_storage.open(name) as fh:
+        return json.load(fh)
+
+
+def current_build(kind, read, write):
+    """
+    Manifest of the last published build (``read()``), or None before the
+    first one. Never builds in the calling thread: if the catalog changed
+    since, ``write(stamp)`` runs in a background thread (one at a time per
+    rebuild lock) and the previous build is served until it publishes.
+    """
+    key = f"movies:{kind}:{get_catalog_version()}"
+    manifest = cache.get(key)
+    if manifest is not None:
+        return manifest
+
+    stamp = snapshot_stamp()
+    manifest = read()
+    if manifest is not None and manifest["version"] == stamp:
+        cache.set(key, manifest, settings.CATALOG_CACHE_TIMEOUT)
+        return manifest
+
+    rebuild_in_background(kind, write, stamp)
+    if manifest is not None:
+        cache.set(key, manifest, STALE_RECHECK_SECONDS)
+    return manifest
+
+
+def rebuild_in_background(kind, write, stamp):
+    lock = f"movies:{kind}:rebuild"
+    if not cache.add(lock, stamp, REBUILD_LOCK_TIMEOUT):
+        return  # already running here or (with a shared cache) in another worker
+
+    def run():
+        try:
+            write(stamp)
+        except Exception:
+            logger.exception("%s rebuild failed", kind)
+        finally:
+            cache.delete(lock)
+            connections.close_all()
+
+    threading.Thread(target=run, name=f"{kind}-rebuild", daemon=True).start()
+
+
+def current_manifest():
+    return current_build("snapshot", read_manifest, write_catalog_snapshot)
+
+
+def precompressed_response(request, name, content_type="application/json", last_modified=None):
+    """
+    Stream a ``.gz`` file from storage as-is with ``Content-Encoding: gzip``,
+    or decompress on the fly for the rare client that can't take gzip.
+    """
+    fh = default_storage.open(name, "rb")
+    if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+        response = FileResponse(fh, content_type=content_type)
+        response["Content-Encoding"] = "gzip"
+    else:
+        stream = gzip.GzipFile(fileobj=fh, mode="rb")
+        response = StreamingHttpResponse(iter(lambda: stream.read(64 * 1024), b""),
+                                         content_type=content_type)
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def prune(directory, keep, min_age=REBUILD_LOCK_TIMEOUT):
+    """
+    Remove build directories under ``directory`` other than ``keep`` (the
+    current and previous builds; local storage only). Directories written
+    to within ``min_age`` seconds are left alone: another process may still
+    be filling them.
+    """
+    try:
+        root = default_storage.path(directory)
+        builds, _ = default_storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return
+    now = time.time()
+    for build in builds:
+        path = os.path.join(root, build)
+        try:
+            recent = now - os.path.getmtime(path) < min_age
+        except FileNotFoundError:
+            continue
+        if build not in keep and not recent:
+            shutil.rmtree(path, ignore_errors=True)
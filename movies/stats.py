@@ -0,0 +1,82 @@
+# movies/stats.py
+"""
+Denormalized comment / rating aggregates on Movie.
+
+Each comment create or delete shifts the counters with a single
+``UPDATE ... SET x = x ± n`` inside the caller's transaction, so reading
+"N comments, 4.2★" never aggregates the comments table.
+``rebuild_comment_stats`` recomputes everything from scratch.
+
+Like play counts, these updates leave ``updated_at`` and the catalog
+version alone: cached catalog responses show new counts once they expire,
+and the movie ETags include the counters (``COUNTERS`` for lists and
+details, ``CARD_COUNTERS`` for the library).
+"""
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Movie
+
+RATINGS = range(1, 6)
+
+# Columns behind comment_count / rating_average on the cards, and with the
+# per-star counts behind rating_histogram on full movies.
+CARD_COUNTERS = ("comment_count", "rating_sum", "rating_count")
+COUNTERS = (*CARD_COUNTERS, *(f"rating_{n}" for n in RATINGS))
+
+
+def _shift(field, delta):
+    if delta >= 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, Value(0))  # never go negative on drifted rows
+
+
+def _apply(comment, sign):
+    updates = {"comment_count": _shift("comment_count", sign)}
+    if comment.rating in RATINGS:
+        updates.update({
+            "rating_sum": _shift("rating_sum", sign * comment.rating),
+            "rating_count": _shift("rating_count", sign),
+            f"rating_{comment.rating}": _shift(f"rating_{comment.rating}", sign),
+        })
+    Movie.objects.filter(pk=comment.movie_id).update(**updates)
+
+
+def comment_added(comment):
+    _apply(comment, +1)
+
+
+def comment_removed(comment):
+    _apply(comment, -1)
+
+
+def rebuild_comment_stats(movies=None):
+    """
+    Recompute the aggregates for ``movies`` (a Movie queryset, all by
+    default) with one grouped query and a bulk update. Returns the number of
+    movies written.
+    """
+    movies = Movie.objects.all() if movies is None else movies
+    rated = Q(comments__rating__gte=1, comments__rating__lte=5)
+    annotated = movies.annotate(
+        _comment_count=Count("comments"),
+        _rating_sum=Sum("comments__rating", filter=rated, default=0),
+        _rating_count=Count("comments", filter=rated),
+        **{f"_rating_{n}": Count("comments", filter=Q(comments__rating=n)) for n in RATINGS},
+    ).only("id")
+
+    fields = list(COUNTERS)
+    now = timezone.now()
+    batch, written = [], 0
+    for movie in annotated.iterator(chunk_size=2000):
+        for name in fields:
+            setattr(movie, name, getattr(movie, f"_{name}"))
+        movie.updated_at = now  # bulk_update skips auto_now; ETags key on it
+        batch.append(movie)
+        if len(batch) >= 1000:
+            written += Movie.objects.bulk_update(batch, [*fields, "updated_at"])
+            batch = []
+    if batch:
+        written += Movie.objects.bulk_update(batch, [*fields, "updated_at"])
+    return written
@@ -1,3 +1,73 @@
-from django.test import TestCase
+import uuid
+from contextlib import ExitStack
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+
+from accounts.jwt import VerifiedEmailTokenSerializer
+from backend_api.db_router import pin_key
+from movies.models import Favorite, Movie
+
+
+@skipUnless("replica_0" in settings.DATABASES,
+            "no replica configured; run with DATABASE_REPLICA_URLS=$DATABASE_URL (see settings)")
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Read-replica routing (backend_api/db_router.py). replica_0 is a TEST
+    MIRROR of default, so both aliases see the same rows and each check only
+    asks which alias served a request's queries. TransactionTestCase, since
+    the router keeps every read on the primary inside a transaction.
+    """
+    databases = {"default", "replica_0"}
+
+    def setUp(self):
+        self.movie = Movie.objects.create(title="Routing check", video_url="https://example.com/check.mp4")
+        user = User.objects.create_user("routing-check")
+        self.auth = {"Authorization": f"Bearer {VerifiedEmailTokenSerializer.get_token(user).access_token}"}
+        cache.delete(pin_key(self.auth["Authorization"]))
+        self.client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+
+    def request(self, method, path, **kwargs):
+        """``(response, aliases that ran a statement while serving it)``."""
+        aliases = set()
+
+        def wrapper(execute, sql, params, many, context):
+            aliases.add(context["connection"].alias)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in self.databases:
+                stack.enter_context(connections[alias].execute_wrapper(wrapper))
+            response = getattr(self.client, method)(path, secure=True, **kwargs)
+        return response, aliases
+
+    def add_favorite(self):
+        return self.request("post", "/api/movies/favorites/add/", data={"movie_id": self.movie.id},
+                            content_type="application/json", headers=self.auth)
+
+    def test_catalog_reads_go_to_replica(self):
+        # A unique query string misses the catalog cache, so the view really queries.
+        response, aliases = self.request("get", f"/api/movies/hero-movies/?check={uuid.uuid4().hex}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {"replica_0"})
+
+    def test_writes_go_to_primary(self):
+        response, aliases = self.add_favorite()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {"default"})
+        self.assertTrue(Favorite.objects.filter(movie=self.movie).exists())
+
+    def test_read_after_write_is_pinned_to_primary(self):
+        self.add_favorite()
+        response, aliases = self.request("get", "/api/movies/favorites/", headers=self.auth)
+        self.assertEqual(aliases, {"default"})
+        self.assertEqual([row["movie"]["id"] for row in response.json()], [self.movie.id])
+
+        cache.delete(pin_key(self.auth["Authorization"]))  # as if REPLICA_STICKY_SECONDS had passed
+        _, aliases = self.request("get", "/api/movies/favorites/", headers=self.auth)
+        self.assertEqual(aliases, {"replica_0"})
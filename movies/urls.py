@@ -1,29 +1,53 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:  # native async under an ASGI server, see movies/async_views.py
+    from . import async_views as hot
+    hero_movies, movie_detail_slug = hot.hero_movies, hot.movie_detail_slug
+else:
+    hot = views
+    hero_movies, movie_detail_slug = views.HeroCarouselMovies.as_view(), views.MovieDetailSlug.as_view()
+
 urlpatterns = [
     path('', views.MovieList.as_view(), name='movie-list'),
 
-    # Movie details (slug-based)
-    path('<slug:slug>/', views.MovieDetailSlug.as_view(), name='movie-detail-slug'),
+    # Precompressed catalog snapshot
+    path('snapshot/', views.CatalogSnapshotView.as_view(), name='catalog-snapshot'),
+
+    # Genre / decade / runtime counts
+    path('facets/', views.MovieFacets.as_view(), name='movie-facets'),
+
+    # Home page genre rows
+    path('genre-rows/', views.GenreRows.as_view(), name='genre-rows'),
 
     # Hero movies
-    path('hero-movies/', views.HeroCarouselMovies.as_view(), name='hero-carousel'),
+    path('hero-movies/', hero_movies, name='hero-carousel'),
+
+    # Favorites + watch-later + progress in one response
+    path('library/', views.library, name='library'),
 
     # Favorites (still using ID)
     path('favorites/', views.favorite_list, name='favorites'),
-    path('favorites/add/', views.add_favorite, name='add-favorite'),
-    path('favorites/<int:movie_id>/remove/', views.remove_favorite, name='remove-favorite'),
+    path('favorites/add/', hot.add_favorite, name='add-favorite'),
+    path('favorites/<int:movie_id>/remove/', hot.remove_favorite, name='remove-favorite'),
 
     # Watch Later (still using ID)
     path('watchlater/', views.watchlater_list, name='watchlater-list'),
-    path('watchlater/add/', views.add_watchlater, name='watchlater-add'),
-    path('watchlater/<int:movie_id>/', views.remove_watchlater, name='watchlater-remove'),
+    path('watchlater/add/', hot.add_watchlater, name='watchlater-add'),
+    path('watchlater/<int:movie_id>/', hot.remove_watchlater, name='watchlater-remove'),
 
     # Progress (slug-based for frontend compatibility)
-    path('progress/update/<slug:slug>/', views.update_progress_slug, name='progress-update-slug'),
+    path('progress/', views.progress_list, name='progress-list'),
+    path('progress/update/<slug:slug>/', hot.update_progress_slug, name='progress-update-slug'),
+
+    # Play counter (buffered)
+    path('<slug:slug>/view/', views.record_view, name='movie-record-view'),
 
     # Comments (slug-based)
     path('<slug:slug>/comments/', views.CommentListCreateSlug.as_view()),
     path('comments/<int:pk>/', views.CommentDelete.as_view()),
+
+    # Movie details (slug-based) – keep last, it matches any single segment
+    path('<slug:slug>/', movie_detail_slug, name='movie-detail-slug'),
 ]
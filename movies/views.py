@@ -1,27 +1,84 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, filters, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import generics, filters, status, permissions, serializers
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.authentication import get_authorization_header
 from django.core.management import call_command
 from django.shortcuts import get_object_or_404
-import requests, logging
+import requests, logging, hashlib
+from collections.abc import Mapping
+from django.utils.cache import get_conditional_response, patch_cache_control
 from .models import Movie, Favorite, WatchLater, PlaybackProgress, Comment
 from .serializers import MovieSerializer, FavoriteSerializer, WatchLaterSerializer, PlaybackProgressSerializer, CommentSerializer
+from .serializers import MovieListSerializer, requested_fields, model_columns
+from .pagination import KeysetPagination, CommentKeysetPagination
+from .filters import MovieFilter
+from .facets import facet_counts
+from .genres import genre_rows
+from django.db import transaction
+from .search import MovieSearchFilter, RelevanceOrderingFilter
+from .cache import CatalogCacheMixin
+from .conditional import ConditionalGetMixin
+from .stats import CARD_COUNTERS
+from accounts.authentication import ClaimsJWTAuthentication
+from .snapshot import current_manifest, genre_key, precompressed_response
+from .sitemaps import current_sitemaps, render_sitemap_index
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.http import HttpResponse
+from .buffers import view_counter, progress_buffer
+from django.core.cache import cache, caches
+from django.http import Http404
+from django.conf import settings
+from django.http import HttpResponseRedirect
+from urllib.parse import urljoin
 from rest_framework.views import APIView
+from rest_framework.throttling import SimpleRateThrottle
 from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum, Value
 
-log = logging.getLogger("django.request")
+log = logging.getLogger("movies.auth_debug")  # sampled / rate-limited in settings.LOGGING
 
 def _dbg_show_auth(request):
+    if not log.isEnabledFor(logging.INFO):
+        return
     hdr = get_authorization_header(request).decode()
-    log.warning("Auth-HDR [%s] %s", request.path, hdr or "NONE")
+    scheme, _, token = hdr.partition(" ")
+    # Never log the credential itself, only enough to tell tokens apart.
+    log.info("Auth-HDR [%s] %s", request.path, f"{scheme} …{token[-6:]}" if token else (scheme or "NONE"))
 
-logging.basicConfig(level=logging.WARNING)   #  add once, near the top
 
 
 
+class SparseFieldsMixin:
+    """
+    ``?fields=a,b`` on GET: the serializer drops everything else and the
+    queryset only loads the columns those fields (plus ordering/lookup) need.
+    Without ``?fields=``, list responses use ``list_serializer_class``.
+    """
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if (self.request.method == 'GET' and self.list_serializer_class
+                and requested_fields(self.request) is None):
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', requested_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        extra = [name.lstrip('-') for name in getattr(self, 'ordering_fields', None) or []]
+        extra.append(self.lookup_field)
+        return queryset.only(*model_columns(self.get_serializer(), extra))
+
 
 @api_view(['POST'])
 def import_movies_view(request):
@@ -32,18 +89,94 @@ def import_movies_view(request):
         return Response({"error": str(e)}, status=500)
 
 
-class MovieList(generics.ListCreateAPIView):
+class MovieList(CatalogCacheMixin, ConditionalGetMixin, SparseFieldsMixin, generics.ListCreateAPIView):
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
+    list_serializer_class = MovieListSerializer  # compact cards unless ?fields= asks otherwise
     permission_classes = [AllowAny]  # ← public
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    search_fields = ['title', 'overview', 'genre']
-    filterset_fields = ['genre', 'is_featured']
+    filter_backends = [MovieSearchFilter, DjangoFilterBackend, RelevanceOrderingFilter]
+    filterset_class = MovieFilter  # genre, is_featured, year__range, runtime_minutes__range
     ordering_fields = ['title', 'year']
     ordering = ['title']
+    pagination_class = KeysetPagination  # opt-in: only with ?cursor= / ?page_size=
 
 
 
+class MovieFacets(CatalogCacheMixin, generics.GenericAPIView):
+    """
+    GET /api/movies/facets/ – movie counts per genre, decade and runtime
+    bucket. Accepts the same filters as the list (``?genre=``,
+    ``?year__range=`` …) so counts follow the current selection.
+    """
+    queryset = Movie.objects.all()
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MovieFilter
+
+    def get(self, request):
+        return Response(facet_counts(self.filter_queryset(self.get_queryset())))
+
+
+class GenreRows(CatalogCacheMixin, APIView):
+    """
+    GET /api/movies/genre-rows/ – the home page rows: every genre (or just
+    ``?genre=Horror&genre=Western``) with its movie count and its ``?limit=``
+    most viewed movies as compact cards, from one grouped query.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 12
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get("limit", self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        slugs = {genre_key(name) for name in request.query_params.getlist("genre") if name.strip()}
+        rows = genre_rows(model_columns(MovieListSerializer()), limit, slugs)
+        return Response([
+            {"genre": genre.name, "slug": genre.slug, "count": total,
+             "movies": MovieListSerializer(movies, many=True).data}
+            for genre, total, movies in rows
+        ])
+
+
+def _sitemaps_or_503():
+    # Never builds here: the last published sitemaps, or 503 until the first build lands.
+    manifest = current_sitemaps()
+    if manifest is None:
+        return None, HttpResponse("Sitemaps are being built, retry shortly.", status=503,
+                                  headers={"Retry-After": "5"}, content_type="text/plain")
+    return manifest, None
+
+
+def sitemap_index(request):
+    """GET /sitemap.xml – index of the prebuilt shards, cached per published build."""
+    manifest, unavailable = _sitemaps_or_503()
+    if unavailable:
+        return unavailable
+    key = f"movies:sitemap-index:{manifest.get('build') or manifest['version']}:{request.get_host()}"
+    xml = cache.get(key)
+    if xml is None:
+        xml = render_sitemap_index(manifest, lambda section: request.build_absolute_uri(
+            reverse('sitemap-section', args=[section])))
+        cache.set(key, xml, settings.CATALOG_CACHE_TIMEOUT)
+    return HttpResponse(xml, content_type="application/xml")
+
+
+def sitemap_section(request, section):
+    """GET /sitemap-<section>.xml – one prebuilt gzipped shard, streamed from storage."""
+    manifest, unavailable = _sitemaps_or_503()
+    if unavailable:
+        return unavailable
+    shard = manifest["sections"].get(section)
+    if shard is None:
+        raise Http404("Unknown sitemap section.")
+    lastmod = parse_datetime(shard["lastmod"]) if shard["lastmod"] else None
+    last_modified = lastmod.timestamp() if lastmod else None
+    return precompressed_response(request, shard["file"], "application/xml", last_modified)
+
+
 class MovieDetail(generics.RetrieveUpdateDestroyAPIView):
     queryset = Movie.objects.all()
     permission_classes = [AllowAny]  # ← public
@@ -54,18 +187,48 @@ class MovieDetail(generics.RetrieveUpdateDestroyAPIView):
                 return [permissions.IsAdminUser()]
             return [permissions.AllowAny()]
 
-class HeroCarouselMovies(APIView):
-    def get(self, request):
-        movies = Movie.objects.filter(is_hero=True).order_by('-year')  # optional: sort newest first
-        serializer = MovieSerializer(movies, many=True)
-        return Response(serializer.data)
+class HeroCarouselMovies(CatalogCacheMixin, ConditionalGetMixin, generics.ListAPIView):
+    queryset = Movie.objects.filter(is_hero=True).order_by('-year')  # optional: sort newest first
+    serializer_class = MovieSerializer
+    filter_backends = []
     
-class MovieDetailSlug(generics.RetrieveAPIView):
+class MovieDetailSlug(CatalogCacheMixin, ConditionalGetMixin, SparseFieldsMixin, generics.RetrieveAPIView):
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = [AllowAny]
     lookup_field = 'slug'
 
+class CatalogSnapshotView(APIView):
+    """
+    GET /api/movies/snapshot/              – whole catalog
+    GET /api/movies/snapshot/?genre=Horror – one genre shard
+
+    Redirects to the precompressed snapshot when CATALOG_SNAPSHOT_URL says
+    where the web tier serves it, otherwise streams the file from storage.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        manifest = current_manifest()
+        if manifest is None:
+            return Response({"detail": "Catalog snapshot is being built, retry shortly."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "5"})
+
+        genre = request.query_params.get("genre")
+        if genre:
+            shard = manifest["genres"].get(genre_key(genre))
+            if shard is None:
+                return Response({"detail": "Unknown genre."}, status=status.HTTP_404_NOT_FOUND)
+            name = shard["file"]
+        else:
+            name = manifest["catalog"]
+
+        if settings.CATALOG_SNAPSHOT_URL:
+            return HttpResponseRedirect(urljoin(settings.CATALOG_SNAPSHOT_URL, name))
+        return precompressed_response(request, name)
+
+
 @api_view(['GET'])
 def fetch_archive_movies(request):
     url = "https://archive.org/advancedsearch.php"
@@ -132,13 +295,18 @@ def fetch_archive_movies(request):
 @permission_classes([IsAuthenticatedOrReadOnly])
 def favorite_list(request):
     _dbg_show_auth(request)   
-    favorites = Favorite.objects.filter(user=request.user)
-    serializer = FavoriteSerializer(favorites, many=True)
+    movie_fields = requested_fields(request)
+    favorites = Favorite.objects.filter(user=request.user).select_related('movie')
+    if movie_fields:
+        columns = model_columns(MovieSerializer(fields=movie_fields))
+        favorites = favorites.only('id', 'user', 'movie', *(f'movie__{c}' for c in columns))
+    serializer = FavoriteSerializer(favorites, many=True, movie_fields=movie_fields)
     return Response(serializer.data)
 
    
 # views.py
 @api_view(['POST'])
+@authentication_classes([ClaimsJWTAuthentication])  # no user lookup: use request.user.id
 @permission_classes([IsAuthenticatedOrReadOnly])
 def add_favorite(request):
     _dbg_show_auth(request)
@@ -147,7 +315,7 @@ def add_favorite(request):
     if not movie_id:
         return Response({'error': 'Movie ID is required'}, status=400)
 
-    if Favorite.objects.filter(user=request.user, movie_id=movie_id).exists():
+    if Favorite.objects.filter(user_id=request.user.id, movie_id=movie_id).exists():
         return Response({'message': 'Already in favorites'}, status=400)
 
     try:
@@ -155,17 +323,18 @@ def add_favorite(request):
     except Movie.DoesNotExist:
         return Response({'error': 'Movie not found'}, status=404)
 
-    Favorite.objects.create(user=request.user, movie=movie)
+    Favorite.objects.create(user_id=request.user.id, movie=movie)
     return Response({'message': 'Added to favorites'})
 
 
 
 
 @api_view(['DELETE'])
+@authentication_classes([ClaimsJWTAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def remove_favorite(request, movie_id):
     _dbg_show_auth(request)
-    favorite = get_object_or_404(Favorite, user=request.user, movie__id=movie_id)
+    favorite = get_object_or_404(Favorite, user_id=request.user.id, movie__id=movie_id)
     favorite.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -181,6 +350,7 @@ def watchlater_list(request):
     return Response(ser.data)
 
 @api_view(["POST"])
+@authentication_classes([ClaimsJWTAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def add_watchlater(request):
     _dbg_show_auth(request)
@@ -188,20 +358,122 @@ def add_watchlater(request):
     if not movie_id:
         return Response({"error": "Movie ID required"}, status=400)
 
-    if WatchLater.objects.filter(user=request.user, movie_id=movie_id).exists():
+    if WatchLater.objects.filter(user_id=request.user.id, movie_id=movie_id).exists():
         return Response({"message": "Already in watch-later"}, status=400)
 
-    WatchLater.objects.create(user=request.user, movie_id=movie_id)
+    WatchLater.objects.create(user_id=request.user.id, movie_id=movie_id)
     return Response({"message": "Added to watch-later"})
 
 @api_view(["DELETE"])
+@authentication_classes([ClaimsJWTAuthentication])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def remove_watchlater(request, movie_id):
     _dbg_show_auth(request)
-    item = get_object_or_404(WatchLater, user=request.user, movie_id=movie_id)
+    item = get_object_or_404(WatchLater, user_id=request.user.id, movie_id=movie_id)
     item.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
+# -------------------------------------------------------------------
+#  Library (favorites + watch-later + progress in one round trip)
+# -------------------------------------------------------------------
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def library(request):
+    """
+    Everything the frontend loads at login, in four queries whatever the
+    library size: one per collection plus one for the distinct movies, which
+    are included once each in the compact card form.
+
+    The ETag comes from ``_library_stamp`` (plus this worker's buffered
+    heartbeats), so an unchanged library is answered with 304 after one
+    small query, whichever worker served the last response.
+    """
+    user_id = request.user.id
+    raw = f"{user_id}|{_library_stamp(user_id)}"
+    if settings.PROGRESS_COALESCE:
+        raw += f"|{sorted(progress_buffer.pending_for_user(user_id).items())}"
+    etag = '"%s"' % hashlib.md5(raw.encode("utf-8")).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+
+    if response is None:
+        favorites = list(Favorite.objects.filter(user_id=user_id).values("id", "movie"))
+        watch_later = WatchLater.objects.filter(user_id=user_id).only("id", "movie", "added_at")
+        progress = PlaybackProgress.objects.filter(user_id=user_id).only("id", "movie", "position", "updated_at")
+
+        watch_later = WatchLaterSerializer(watch_later, many=True).data
+        progress = PlaybackProgressSerializer(progress, many=True).data
+        if settings.PROGRESS_COALESCE:
+            progress = _merge_buffered_progress(user_id, progress)
+
+        movie_ids = {row["movie"] for rows in (favorites, watch_later, progress) for row in rows}
+        movies = Movie.objects.filter(id__in=movie_ids).only(*model_columns(MovieListSerializer()))
+        response = Response({
+            "movies": MovieListSerializer(movies, many=True).data,
+            "favorites": favorites,
+            "watch_later": watch_later,
+            "progress": progress,
+        })
+
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _library_stamp(user_id):
+    """
+    One row that changes whenever the library response would: per
+    collection the row count and newest id / timestamp, the newest
+    Movie.updated_at and the sums of the card counters over the library's
+    movies (``stats.CARD_COUNTERS``, which leave updated_at alone). Read from
+    the database, not a per-process counter, so every worker agrees on it.
+    """
+    def per_user(model, *aggregates):
+        rows = model.objects.filter(user_id=OuterRef("pk")).order_by().values("user_id")
+        return [Subquery(rows.annotate(value=aggregate).values("value")) for aggregate in aggregates]
+
+    in_library = Q()
+    for model in (Favorite, WatchLater, PlaybackProgress):
+        in_library |= Q(pk__in=model.objects.filter(user_id=user_id).values("movie_id"))
+    cards = Movie.objects.filter(in_library).order_by().annotate(library=Value(1)).values("library")
+
+    return User.objects.filter(pk=user_id).values_list(
+        *per_user(Favorite, Count("pk"), Max("pk")),
+        *per_user(WatchLater, Count("pk"), Max("added_at")),
+        *per_user(PlaybackProgress, Count("pk"), Max("updated_at")),
+        Subquery(Movie.objects.order_by("-updated_at").values("updated_at")[:1]),
+        *(Subquery(cards.annotate(total=Sum(name)).values("total")) for name in CARD_COUNTERS),
+    ).first()
+
+# -------------------------------------------------------------------
+#  View counter
+# -------------------------------------------------------------------
+
+class PlayCountThrottle(SimpleRateThrottle):
+    """Per client IP, on the shared ``throttle`` cache (see accounts/throttling.py)."""
+    cache = caches["throttle"]
+    scope = "view"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([PlayCountThrottle])
+def record_view(request, slug):
+    """
+    Count one play. The increment is buffered in-process and written to
+    Movie.views in bulk, so hot titles never queue on their row lock.
+    Unknown slugs are refused (via the cached slug -> id lookup) instead of
+    filling the buffer.
+    """
+    if _movie_id_for_slug(slug) is None:
+        raise Http404("No Movie matches the given query.")
+    view_counter.add(slug, 1)
+    return Response({"queued": True}, status=status.HTTP_202_ACCEPTED)
+
 # -------------------------------------------------------------------
 #  Playback progress
 # -------------------------------------------------------------------
@@ -213,22 +485,90 @@ def progress_list(request):
     """Return all progress rows for the current user."""
     rows = PlaybackProgress.objects.filter(user=request.user).select_related("movie")
     ser  = PlaybackProgressSerializer(rows, many=True)
+    if settings.PROGRESS_COALESCE:
+        return Response(_merge_buffered_progress(request.user.id, ser.data))
     return Response(ser.data)
 
 
+def _merge_buffered_progress(user_id, data):
+    """
+    Overlay positions still waiting in this worker's heartbeat buffer.
+
+    Per worker by design: heartbeats buffered by another worker are not
+    visible here, so a read may lag the player by up to
+    PROGRESS_FLUSH_SECONDS. Pause/ended/exit events flush right away, so a
+    position the user stopped at is always in the database.
+    """
+    buffered = progress_buffer.pending_for_user(user_id)
+    if not buffered:
+        return data
+    as_text = serializers.DateTimeField().to_representation
+    rows = [dict(row) for row in data]
+    for row in rows:
+        hit = buffered.pop(row["movie"], None)
+        if hit:
+            row["position"], row["updated_at"] = hit[0], as_text(hit[1])
+    rows += [{"id": None, "movie": movie_id, "position": position, "updated_at": as_text(at)}
+             for movie_id, (position, at) in buffered.items()]
+    rows.sort(key=lambda row: row["updated_at"], reverse=True)
+    return rows
+
+
+def _movie_id_for_slug(slug):
+    key = f"movies:slug-id:{slug}"
+    movie_id = cache.get(key)
+    if movie_id is None:
+        movie_id = Movie.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if movie_id is not None:
+            cache.set(key, movie_id, 60 * 60)
+    return movie_id
+
+
+# Player events that should persist the position right away.
+PROGRESS_FLUSH_EVENTS = {"pause", "ended", "exit"}
+
+MAX_POSITION = 2 ** 31 - 1  # PlaybackProgress.position is a 32-bit column
+
+
+def parse_position(data):
+    """``(seconds, None)`` for a valid progress payload, else ``(None, error message)``."""
+    if not isinstance(data, Mapping):
+        return None, "Request body must be a JSON object"
+    position = data.get("position")
+    if position is None:
+        return None, "Position required"
+    try:
+        position = int(position)
+    except (TypeError, ValueError):
+        return None, "Position must be a whole number of seconds"
+    if not 0 <= position <= MAX_POSITION:
+        return None, f"Position must be between 0 and {MAX_POSITION} seconds"
+    return position, None
+
+
 @api_view(["POST"])
+@authentication_classes([ClaimsJWTAuthentication])  # heartbeat path: no user lookup
 @permission_classes([IsAuthenticatedOrReadOnly])
 def update_progress_slug(request, slug):
-    movie = get_object_or_404(Movie, slug=slug)
-    position = request.data.get("position")
-
-    if position is None:
-        return Response({"error": "Position required"}, status=400)
+    position, error = parse_position(request.data)
+    if error:
+        return Response({"error": error}, status=400)
+
+    if settings.PROGRESS_COALESCE:
+        # Heartbeat only lands in the buffer; the flush upserts the latest one.
+        movie_id = _movie_id_for_slug(slug)
+        if movie_id is None:
+            raise Http404
+        progress_buffer.record(request.user.id, movie_id, position)
+        if request.data.get("event") in PROGRESS_FLUSH_EVENTS:
+            progress_buffer.flush()
+        return Response({"success": True, "position": position})
 
+    movie = get_object_or_404(Movie, slug=slug)
     row, _ = PlaybackProgress.objects.update_or_create(
-        user=request.user,
+        user_id=request.user.id,
         movie=movie,
-        defaults={"position": int(position)},
+        defaults={"position": position},
     )
     return Response({"success": True, "position": row.position})
 
@@ -243,6 +583,7 @@ class CommentListCreate(generics.ListCreateAPIView):
     def get_queryset(self):
         return Comment.objects.filter(movie_id=self.kwargs["movie_id"])
 
+    @transaction.atomic  # comment row + Movie counters (see movies/stats.py) commit together
     def perform_create(self, serializer):
         serializer.save(user=self.request.user,
                         movie_id=self.kwargs["movie_id"])
@@ -256,6 +597,7 @@ class CommentDelete(generics.DestroyAPIView):
     serializer_class   = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    @transaction.atomic
     def perform_destroy(self, instance):
         # Optional: allow only the author (or staff) to delete
         if instance.user != self.request.user and not self.request.user.is_staff:
@@ -265,11 +607,13 @@ class CommentDelete(generics.DestroyAPIView):
 class CommentListCreateSlug(generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentKeysetPagination  # opt-in: only with ?cursor= / ?page_size=
 
     def get_queryset(self):
         movie = get_object_or_404(Movie, slug=self.kwargs["slug"])
-        return Comment.objects.filter(movie=movie)
+        return Comment.objects.filter(movie=movie).select_related("user")
 
+    @transaction.atomic
     def perform_create(self, serializer):
         movie = get_object_or_404(Movie, slug=self.kwargs["slug"])
         serializer.save(user=self.request.user, movie=movie)